@@ -1,16 +1,19 @@
-from typing import List
 from fastapi import APIRouter, Response, Depends, Request
 from fastapi.responses import JSONResponse
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.templates import templates
 from app.models.models import User
-from app.auth.utils import authenticate_user, set_tokens
+from app.auth.utils import (
+    authenticate_user,
+    get_password_hash_async,
+    set_tokens)
 from app.dependencies.auth_dep import (
-    get_current_user,
+    get_current_db_user,
     get_current_admin_user,
     check_refresh_token,
 )
+from app.dao.database import get_read_session
 from app.dependencies.dao_dep import (
     get_session_with_commit,
     get_session_without_commit)
@@ -24,6 +27,7 @@ from app.schemas.auth import (
     EmailModel,
     SUserAddDB,
     SUserInfo)
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -40,6 +44,8 @@ async def register_user(user_data: SUserRegister,
         raise UserAlreadyExistsException
     user_data_dict = user_data.model_dump()
     user_data_dict.pop('confirm_password', None)
+    user_data_dict['password'] = await get_password_hash_async(
+        user_data.password)
     await user_dao.add(values=SUserAddDB(**user_data_dict))
     return {'message': 'Вы успешно зарегистрированы!'}
 
@@ -57,10 +63,11 @@ async def auth_user(
 
     if not (user and await authenticate_user(
         user=user,
-        password=user_data.password
+        password=user_data.password,
+        session=session
     )):
         raise IncorrectEmailOrPasswordException
-    set_tokens(response, user.id)
+    set_tokens(response, user)
     return {
         'ok': True,
         'message': 'Авторизация успешна!'
@@ -75,17 +82,25 @@ async def logout(response: Response):
 
 
 @router.get("/me/")
-async def get_me(user_data: User = Depends(get_current_user)) -> SUserInfo:
+async def get_me(user_data: User = Depends(get_current_db_user)) -> SUserInfo:
     return SUserInfo.model_validate(user_data)
 
 
 @router.get("/all_users/")
 async def get_all_users(
-    session: AsyncSession = Depends(get_session_with_commit),
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
     user_data: User = Depends(get_current_admin_user),
-) -> List[SUserInfo]:
-    users = await UsersDAO(session).find_all()
-    return [SUserInfo.model_validate(user) for user in users]
+) -> Page[SUserInfo]:
+    page = await UsersDAO(session).paginate(
+        cursor=cursor, limit=limit, load="list")
+    return Page[SUserInfo](
+        items=[SUserInfo.model_validate(user) for user in page.items],
+        limit=page.limit,
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor,
+    )
 
 
 @router.post("/refresh")
@@ -93,14 +108,14 @@ async def process_refresh_token(
         response: Response,
         user: User = Depends(check_refresh_token)
 ):
-    set_tokens(response, user.id)
+    set_tokens(response, user)
     return {"message": "Токены успешно обновлены"}
 
 
 @router.get("/profile")
 async def get_profile(
     request: Request,
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_db_user)
 ):
 
     accept_header = request.headers.get("accept", "")
@@ -1,10 +1,20 @@
+import asyncio
+import math
+import time
+from loguru import logger
 from passlib.context import CryptContext
 from jose import jwt
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
 from fastapi import Request
 from fastapi.responses import Response, RedirectResponse
 from app.config import settings
-from app.exceptions import TokenNoFound
+from app.core.executor import BoundedExecutor, ExecutorBusyError
+from app.dao.database import engines
+from app.exceptions import TokenNoFound, ServiceBusyException
+from app.models.models import AppSetting
 
 
 def create_tokens(data: dict) -> dict:
@@ -12,7 +22,8 @@ def create_tokens(data: dict) -> dict:
     now = datetime.now(timezone.utc)
 
     # AccessToken - 30 минут
-    access_expire = now + timedelta(seconds=1800)
+    access_expire = now + timedelta(
+        seconds=settings.ACCESS_TOKEN_EXPIRE_SECONDS)
     access_payload = data.copy()
     access_payload.update({
         "exp": int(access_expire.timestamp()),
@@ -39,19 +50,45 @@ def create_tokens(data: dict) -> dict:
     return {"access_token": access_token, "refresh_token": refresh_token}
 
 
-async def authenticate_user(user, password):
-    if not user or verify_password(
+async def authenticate_user(
+    user,
+    password,
+    session: AsyncSession | None = None
+):
+    if not user:
+        return None
+    is_valid, new_hash = await verify_and_update_password_async(
         plain_password=password,
         hashed_password=user.password
-    ) is False:
+    )
+    if not is_valid:
         return None
+    # Хеш со стоимостью, отличной от текущей, пересчитываем при входе
+    if new_hash is not None and session is not None:
+        try:
+            user.password = new_hash
+            await session.commit()
+            logger.info(f"Хеш пароля пользователя {user.id} пересчитан.")
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Ошибка при пересчёте хеша пароля: {e}")
     return user
 
 
-def set_tokens(response: Response, user_id: int):
-    new_tokens = create_tokens(data={"sub": str(user_id)})
-    access_token = new_tokens.get('access_token')
-    refresh_token = new_tokens.get("refresh_token")
+def token_claims(user) -> dict:
+    """Данные пользователя, которые несёт access-токен."""
+    return {
+        "sub": str(user.id),
+        "role_id": user.role_id,
+        "position_id": user.position_id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+    }
+
+
+def set_token_cookies(response: Response, tokens: dict):
+    access_token = tokens.get('access_token')
+    refresh_token = tokens.get("refresh_token")
 
     if access_token is not None:
         response.set_cookie(
@@ -72,6 +109,10 @@ def set_tokens(response: Response, user_id: int):
         )
 
 
+def set_tokens(response: Response, user):
+    set_token_cookies(response, create_tokens(data=token_claims(user)))
+
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -83,6 +124,169 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# bcrypt отпускает GIL, поэтому хеширование в потоках не блокирует event loop
+password_executor = BoundedExecutor(
+    "bcrypt",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    try:
+        return await password_executor.run(get_password_hash, password)
+    except ExecutorBusyError:
+        raise ServiceBusyException
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await password_executor.run(
+            verify_password, plain_password, hashed_password)
+    except ExecutorBusyError:
+        raise ServiceBusyException
+
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> tuple[bool, str | None]:
+    try:
+        return await password_executor.run(
+            verify_and_update_password, plain_password, hashed_password)
+    except ExecutorBusyError:
+        raise ServiceBusyException
+
+
+# Стоимость, по которой замеряется скорость bcrypt на текущей машине
+CALIBRATION_ROUNDS = 8
+
+
+def calibrate_bcrypt_rounds(target_ms: int, samples: int = 3) -> int:
+    """
+    Подбирает стоимость bcrypt, при которой хеширование занимает не больше
+    target_ms на текущей машине.
+
+    Каждый следующий раунд удваивает время, поэтому достаточно замерить
+    дешёвую стоимость и экстраполировать.
+    """
+    handler = pwd_context.handler("bcrypt").using(rounds=CALIBRATION_ROUNDS)
+    elapsed = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration")
+        elapsed.append(time.perf_counter() - start)
+    base_ms = min(elapsed) * 1000
+    rounds = CALIBRATION_ROUNDS + int(math.floor(math.log2(target_ms / base_ms)))
+    return clamp_bcrypt_rounds(rounds)
+
+
+def clamp_bcrypt_rounds(rounds: int) -> int:
+    """Ограничивает стоимость bcrypt пределами из настроек."""
+    return max(settings.BCRYPT_MIN_ROUNDS, min(rounds, settings.BCRYPT_MAX_ROUNDS))
+
+
+def configure_password_context(rounds: int):
+    """
+    Назначает стоимость bcrypt для новых хешей. Хеши дешевле неё считаются
+    устаревшими и пересчитываются при следующем входе, более дорогие
+    остаются как есть — перехеширование только повышает стоимость.
+    """
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+    )
+    settings.BCRYPT_ROUNDS = rounds
+
+
+def bcrypt_rounds_setting() -> str:
+    """
+    Имя строки app_settings с откалиброванной стоимостью. В имя входит
+    целевое время, поэтому при смене BCRYPT_TARGET_MS стоимость
+    подбирается заново.
+    """
+    return f"bcrypt.rounds.{settings.BCRYPT_TARGET_MS}ms"
+
+
+async def _stored_bcrypt_rounds() -> int | None:
+    async with engines.write_engine.connect() as conn:
+        value = await conn.scalar(
+            select(AppSetting.value)
+            .where(AppSetting.name == bcrypt_rounds_setting())
+        )
+    return None if value is None else int(value)
+
+
+async def _calibrate_bcrypt_rounds() -> int:
+    rounds = await password_executor.run(
+        calibrate_bcrypt_rounds, settings.BCRYPT_TARGET_MS)
+    logger.info(
+        f"Стоимость bcrypt откалибрована: {rounds} "
+        f"(цель {settings.BCRYPT_TARGET_MS} мс)")
+    return rounds
+
+
+async def load_bcrypt_rounds() -> int:
+    """
+    Стоимость bcrypt, общая для всех воркеров. Первый запущенный воркер
+    калибрует её и сохраняет в таблице app_settings, остальные берут
+    сохранённое значение, поэтому хеши не пересчитываются то в одну,
+    то в другую сторону при входах через разные воркеры. Сохранённое
+    значение ограничивается текущими BCRYPT_MIN_ROUNDS и BCRYPT_MAX_ROUNDS.
+    """
+    rounds = await _stored_bcrypt_rounds()
+    if rounds is not None:
+        return clamp_bcrypt_rounds(rounds)
+    rounds = await _calibrate_bcrypt_rounds()
+    try:
+        async with engines.write_engine.begin() as conn:
+            await conn.execute(
+                insert(AppSetting)
+                .values(name=bcrypt_rounds_setting(), value=str(rounds))
+            )
+    except IntegrityError:
+        # Калибровку успел сохранить другой воркер — берём его значение
+        return clamp_bcrypt_rounds(await _stored_bcrypt_rounds())
+    return rounds
+
+
+async def recalibrate_bcrypt_rounds() -> int:
+    """
+    Калибрует стоимость заново и заменяет сохранённую, например после
+    переезда на другое железо. Воркеры применяют её после перезапуска.
+    """
+    rounds = await _calibrate_bcrypt_rounds()
+    async with engines.write_engine.begin() as conn:
+        await conn.execute(
+            delete(AppSetting)
+            .where(AppSetting.name == bcrypt_rounds_setting())
+        )
+        await conn.execute(
+            insert(AppSetting)
+            .values(name=bcrypt_rounds_setting(), value=str(rounds))
+        )
+    await engines.dispose()
+    return rounds
+
+
+async def setup_password_hashing():
+    """
+    Назначает стоимость bcrypt: явную из настроек или откалиброванную
+    и сохранённую в базе.
+    """
+    rounds = settings.BCRYPT_ROUNDS
+    if rounds is None:
+        rounds = await load_bcrypt_rounds()
+    configure_password_context(rounds)
+
+
 def redirect_to_login(request: Request, page) -> RedirectResponse:
     accept_header = request.headers.get("accept", "")
     if "application/json" in accept_header:
@@ -92,3 +296,8 @@ def redirect_to_login(request: Request, page) -> RedirectResponse:
             url=request.url_for(page),
             status_code=303
         )
+
+
+if __name__ == "__main__":
+    # python -m app.auth.utils — повторная калибровка стоимости bcrypt
+    asyncio.run(recalibrate_bcrypt_rounds())
@@ -8,8 +8,99 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
 
+    # Пулы соединений. URL реплики для чтения по умолчанию — для SQLite та же
+    # база в режиме только чтения
+    DB_READ_URL: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+
+    # Аутентификация по claims access-токена без запроса к БД
+    AUTH_STATELESS: bool = True
+    ACCESS_TOKEN_EXPIRE_SECONDS: int = 1800
+
+    # Пул потоков для bcrypt: число потоков и длина очереди ожидания
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE: int = 64
+
+    # Стоимость bcrypt: если не задана, подбирается при старте под целевое время
+    BCRYPT_ROUNDS: int | None = None
+    BCRYPT_TARGET_MS: int = 250
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 16
+
+    # Профиль производительности SQLite, применяется к каждому соединению.
+    # None — оставить значение SQLite по умолчанию
+    SQLITE_JOURNAL_MODE: str | None = "WAL"
+    SQLITE_SYNCHRONOUS: str | None = "NORMAL"
+    SQLITE_MMAP_SIZE: int | None = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int | None = -64000
+    SQLITE_TEMP_STORE: str | None = "MEMORY"
+    SQLITE_BUSY_TIMEOUT: int | None = 5000
+    # Проверка внешних ключей выключена, как и прежде: в существующих базах
+    # бывают строки без родителя (например, пользователи без роли)
+    SQLITE_FOREIGN_KEYS: bool | None = None
+
+    # Шаг разреженных рангов в очередях процессов и действий
+    QUEUE_RANK_STEP: int = 1024
+
+    # Пагинация списков
+    PAGE_SIZE: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    # Размер пачки при потоковой выгрузке
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Размер пачки при массовой вставке и обновлении
+    BULK_CHUNK_SIZE: int = 1000
+
+    # Профиль шаблонов Jinja2: перечитывание с диска (для разработки),
+    # кеш байткода (без каталога — временный каталог пользователя) и размер
+    # порции потокового ответа в символах
+    TEMPLATES_AUTO_RELOAD: bool = False
+    TEMPLATES_BYTECODE_CACHE: bool = True
+    TEMPLATES_CACHE_DIR: str | None = None
+    TEMPLATES_STREAM_CHUNK: int = 16384
+
+    # Сколько фрагментов тега {% cache %} хранить в памяти процесса
+    TEMPLATES_FRAGMENT_CACHE_SIZE: int = 1024
+
+    # Логирование: общий уровень, уровни модулей по префиксу имени
+    # (например {"app.dao": "DEBUG"}), вывод в JSON и доля записываемых
+    # частых событий чтения DAO
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: dict[str, str] = {}
+    LOG_JSON: bool = False
+    LOG_DAO_SAMPLE_RATE: float = 0.1
+
+    # Учёт SQL-запросов на запрос HTTP: сколько повторов одного запроса
+    # считать N+1 и падать ли с ошибкой вместо предупреждения в логе
+    QUERY_REPEAT_LIMIT: int = 10
+    QUERY_STRICT: bool = False
+
+    # Сколько номеров заказов резервирует процесс за одно обращение к БД
+    ORDER_NUMBER_BLOCK_SIZE: int = 100
+
+    # Статус завершённого процесса или действия для сводки по заказам
+    WORKFLOW_DONE_STATUS: str = "done"
+
     model_config = SettingsConfigDict(env_file=f"{BASE_DIR}/.env")
 
+    @property
+    def sqlite_pragmas(self) -> dict:
+        pragmas = {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "temp_store": self.SQLITE_TEMP_STORE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT,
+            "foreign_keys": self.SQLITE_FOREIGN_KEYS,
+        }
+        return {name: value for name, value in pragmas.items() if value is not None}
+
 
 # Получаем параметры для загрузки переменных среды
 settings = Settings()
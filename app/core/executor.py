@@ -0,0 +1,94 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+R = TypeVar("R")
+
+
+class ExecutorBusyError(RuntimeError):
+    """Очередь пула заполнена, новая задача не принята."""
+
+
+class ExecutorMetrics:
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class BoundedExecutor:
+    """
+    Пул потоков для блокирующих CPU-задач с ограниченной очередью.
+
+    Одновременно выполняется не больше max_workers задач и ещё max_queue
+    ждут свободного потока; остальные сразу отклоняются ExecutorBusyError,
+    чтобы всплеск запросов не копил бесконечную очередь.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.metrics = ExecutorMetrics()
+        self._pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def in_flight(self) -> int:
+        return min(self._pending, self.max_workers)
+
+    @property
+    def queued(self) -> int:
+        return max(self._pending - self.max_workers, 0)
+
+    async def run(self, fn: Callable[..., R], *args) -> R:
+        if self._pending >= self.max_workers + self.max_queue:
+            self.metrics.rejected += 1
+            raise ExecutorBusyError(f"Очередь пула {self.name} заполнена")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.name,
+            )
+
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            result = fn(*args)
+            return result, started - submitted, time.perf_counter() - started
+
+        self._pending += 1
+        try:
+            result, wait, run = await asyncio.get_running_loop().run_in_executor(
+                self._executor, job)
+        except Exception:
+            self.metrics.failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self.metrics.completed += 1
+        self.metrics.wait_seconds += wait
+        self.metrics.run_seconds += run
+        self.metrics.max_wait_seconds = max(self.metrics.max_wait_seconds, wait)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            **self.metrics.as_dict(),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from app.config import settings
+
+
+class LRUCache:
+    """Словарь с ограничением размера: вытесняются давно не читанные ключи."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Тег {% cache "имя", вход1, вход2 %}...{% endcache %}.
+
+    Содержимое блока рендерится один раз для каждого набора входов и затем
+    берётся из LRU-кеша окружения. Ключ строится только из перечисленных
+    входов, поэтому в них должно быть всё, от чего зависит фрагмент:
+    ID и роль пользователя, версии таблиц и т. п.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(
+            fragment_cache=LRUCache(settings.TEMPLATES_FRAGMENT_CACHE_SIZE))
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        # Имя шаблона и строка тега отделяют разные блоки с одинаковым именем
+        location = nodes.Const(f"{parser.name}:{lineno}")
+        return nodes.CallBlock(
+            self.call_method("_cache", [location, nodes.List(args)]),
+            [], [], body,
+        ).set_lineno(lineno)
+
+    def _cache(self, location: str, inputs: list, caller) -> Markup:
+        key = (location, *map(str, inputs))
+        cache: LRUCache = self.environment.fragment_cache
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = Markup(caller())
+            cache.set(key, fragment)
+        return fragment
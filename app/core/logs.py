@@ -0,0 +1,29 @@
+import sys
+
+from loguru import logger
+
+from app.config import settings
+
+
+def setup_logging():
+    """
+    Заменяет стандартный обработчик loguru фоновым: записи складываются в
+    очередь (enqueue=True) и выводятся отдельным потоком, не блокируя event
+    loop. Уровень задаётся для всего приложения (LOG_LEVEL) и отдельно для
+    модулей по префиксу имени (LOG_LEVELS).
+    """
+    levels = {"": settings.LOG_LEVEL, **settings.LOG_LEVELS}
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        # Записи ниже самого низкого уровня отбрасываются ещё до форматирования
+        level=min(logger.level(level).no for level in levels.values()),
+        filter=levels,
+        serialize=settings.LOG_JSON,
+        enqueue=True,
+    )
+
+
+async def shutdown_logging():
+    """Дожидается вывода записей, оставшихся в очереди."""
+    await logger.complete()
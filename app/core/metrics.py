@@ -0,0 +1,176 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+# Границы корзин гистограмм по умолчанию, в секундах
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value) -> str:
+    return (
+        str(value).replace("\\", "\\\\")
+        .replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def exposition(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: Iterable[tuple[str, dict[str, str], float]],
+) -> list[str]:
+    """Строки текстового формата Prometheus для одной метрики."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    lines += [
+        f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+        for suffix, labels, value in samples
+    ]
+    return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def collect(self) -> list[str]:
+        return exposition(self.name, "gauge", self.documentation, (
+            ("", dict(zip(self.labelnames, key)), value)
+            for key, value in self._values.items()
+        ))
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets=DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Для каждого набора меток: счётчики корзин, сумма и число наблюдений
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self) -> list[str]:
+        samples = []
+        for key, (counts, total, count) in self._series.items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append(
+                    ("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(("_bucket", {**labels, "le": "+Inf"}, count))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, count))
+        return exposition(self.name, "histogram", self.documentation, samples)
+
+
+class MetricsRegistry:
+    """
+    Метрики приложения в текстовом формате Prometheus.
+
+    Гистограммы и gauge-метрики копятся в памяти процесса; значения, которые
+    удобнее снимать в момент опроса (пулы соединений, пул bcrypt),
+    отдают функции-коллекторы.
+    """
+
+    def __init__(self):
+        self._metrics: list[Gauge | Histogram] = []
+        self._collectors: list[Callable[[], list[str]]] = []
+
+    def histogram(self, name: str, documentation: str, labelnames=(),
+                  buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], list[str]]):
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.collect()
+        for collect in self._collectors:
+            lines += collect()
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Время обработки запроса HTTP",
+    ("method", "route", "status"),
+)
+requests_in_flight = metrics.gauge(
+    "http_requests_in_flight",
+    "Запросы HTTP, обрабатываемые в данный момент",
+    ("method",),
+)
+session_lifetime = metrics.histogram(
+    "db_session_lifetime_seconds",
+    "Время жизни сессии SQLAlchemy, выданной зависимостью",
+    ("dependency",),
+)
+template_render = metrics.histogram(
+    "template_render_seconds",
+    "Время рендеринга шаблона Jinja2",
+    ("template",),
+)
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Callable
+
+from loguru import logger
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config import settings
+from app.dao.database import engines
+from app.models.models import Counter, Orders
+
+
+class SequenceAllocator:
+    """
+    Выдаёт уникальные номера из блоков, зарезервированных в таблице counters.
+
+    Блок резервируется одним атомарным UPDATE ... RETURNING в отдельной
+    транзакции, после чего номера раздаются из памяти без обращения к БД.
+    Разные процессы получают непересекающиеся блоки, поэтому номера
+    не совпадают даже при одновременном создании заказов. Номера из
+    неиспользованного остатка блока (перезапуск, откат транзакции)
+    пропадают — последовательность уникальна, но не обязана быть сплошной.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        block_size: int,
+        initial: Callable[[], object] | None = None,
+    ):
+        self.name = name
+        self.block_size = block_size
+        # Выражение для первого значения, если строки счётчика ещё нет
+        self._initial = initial
+        self._next = 0
+        self._end = 0
+        self._lock = asyncio.Lock()
+
+    async def next(self) -> int:
+        async with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = await self._reserve()
+            value = self._next
+            self._next += 1
+            return value
+
+    async def _reserve(self) -> tuple[int, int]:
+        async with engines.write_engine.begin() as conn:
+            end = await self._advance(conn)
+            if end is None:
+                end = await self._create(conn)
+        logger.info(
+            f"Счётчик {self.name}: зарезервирован блок "
+            f"{end - self.block_size}..{end - 1}"
+        )
+        return end - self.block_size, end
+
+    async def _advance(self, conn: AsyncConnection) -> int | None:
+        result = await conn.execute(
+            update(Counter)
+            .where(Counter.name == self.name)
+            .values(next_value=Counter.next_value + self.block_size)
+            .returning(Counter.next_value)
+        )
+        return result.scalar_one_or_none()
+
+    async def _create(self, conn: AsyncConnection) -> int:
+        start = self._initial() if self._initial is not None else 1
+        try:
+            async with conn.begin_nested():
+                result = await conn.execute(
+                    insert(Counter)
+                    .values(name=self.name, next_value=start + self.block_size)
+                    .returning(Counter.next_value)
+                )
+                return result.scalar_one()
+        except IntegrityError:
+            # Строку успел создать другой процесс — берём блок из неё
+            return await self._advance(conn)
+
+
+order_numbers = SequenceAllocator(
+    "orders.number",
+    block_size=settings.ORDER_NUMBER_BLOCK_SIZE,
+    # Без миграции продолжаем после уже выданных номеров
+    initial=lambda: (
+        select(func.coalesce(func.max(Orders.number), 0) + 1)
+        .scalar_subquery()
+    ),
+)
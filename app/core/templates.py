@@ -1,3 +1,112 @@
+import hashlib
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+from fastapi.responses import StreamingResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from loguru import logger
+
+from app.config import settings
+from app.core.fragment_cache import FragmentCacheExtension
+from app.core.metrics import template_render
+
+TEMPLATES_DIR = "app/templates"
+
+
+class TimedTemplate(Template):
+    """Шаблон, время рендеринга которого попадает в метрики."""
+
+    def render(self, *args, **kwargs) -> str:
+        with template_render.time(template=self.name):
+            return super().render(*args, **kwargs)
+
+    def generate(self, *args, **kwargs) -> Iterator[str]:
+        started = time.perf_counter()
+        try:
+            yield from super().generate(*args, **kwargs)
+        finally:
+            template_render.observe(
+                time.perf_counter() - started, template=self.name)
+
+
+def templates_fingerprint(directory: str = TEMPLATES_DIR) -> str:
+    """Хеш содержимого шаблонов: меняется при каждом изменении разметки."""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(Path(directory).rglob("*.html")):
+        digest.update(path.relative_to(directory).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def create_environment() -> Environment:
+    """
+    Окружение Jinja2 по профилю из настроек. Без auto_reload шаблоны не
+    проверяются на диске при каждом рендеринге, а байткод из кеша позволяет
+    воркерам не компилировать шаблоны заново при старте.
+    """
+    bytecode_cache = None
+    if settings.TEMPLATES_BYTECODE_CACHE:
+        if settings.TEMPLATES_CACHE_DIR:
+            Path(settings.TEMPLATES_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+        # Без каталога Jinja2 использует временный каталог пользователя
+        bytecode_cache = FileSystemBytecodeCache(settings.TEMPLATES_CACHE_DIR)
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+        bytecode_cache=bytecode_cache,
+        extensions=[FragmentCacheExtension],
+    )
+    env.template_class = TimedTemplate
+    return env
+
+
+def precompile_templates() -> int:
+    """Загружает все шаблоны в кеш окружения (и байткод — в кеш на диске)."""
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.get_template(name)
+    logger.info(f"Шаблоны загружены: {len(names)}")
+    return len(names)
+
+
+async def _chunks(pieces: Iterator[str], size: int) -> AsyncIterator[str]:
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_template(
+    name: str,
+    context: dict,
+    status_code: int = 200,
+    headers: dict | None = None,
+) -> StreamingResponse:
+    """
+    Отдаёт шаблон потоком через Template.generate(): первые байты страницы
+    уходят клиенту до того, как отрендерен весь список.
+
+    Все данные для шаблона должны быть загружены заранее — сессия
+    зависимости к началу отправки тела уже закрыта.
+    """
+    template = templates.get_template(name)
+    return StreamingResponse(
+        _chunks(template.generate(context), settings.TEMPLATES_STREAM_CHUNK),
+        status_code=status_code,
+        headers=headers,
+        media_type="text/html; charset=utf-8",
+    )
+
 
-templates = Jinja2Templates(directory="app/templates")
\ No newline at end of file
+templates = Jinja2Templates(env=create_environment())
+TEMPLATES_FINGERPRINT = templates_fingerprint()
@@ -1,11 +1,25 @@
+import asyncio
 from fastapi import Request, HTTPException
-from sqlalchemy import select, func, update
+from loguru import logger
+from sqlalchemy import select, func, update, bindparam
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 from collections.abc import Sequence
 
+from app.config import settings
+from app.dao.database import engines
+from app.dao.loaders import loader_options
 from app.models.models import Process, Action
 
 
+# Поле родителя для моделей с очередью
+QUEUE_PARENTS = {
+    Process: "order_id",
+    Action: "process_id",
+}
+
+
 def redirect_or_raise(request: Request, exc: Exception):
     """Если accept: text/html или application/json — выбрасываем исключение.
     Иначе редиректим на login_page."""
@@ -28,13 +42,31 @@ class QueueService:
 
         process = Process(
             order_id=order_id,
-            queue=(max_queue or 0) + 1
+            queue=(max_queue or 0) + settings.QUEUE_RANK_STEP
         )
 
         self.session.add(process)
         await self.session.commit()
         return process
 
+    async def remove_process(self, process_id: int):
+        """Удаляет процесс вместе с его действиями."""
+        process = await self.session.get(
+            Process, process_id, options=loader_options(Process, "detail"))
+        if not process:
+            raise ValueError("Process not found")
+        await self.session.delete(process)
+        await self.session.commit()
+
+    async def set_process_status(self, process_id: int, status: str) -> Process:
+        """Меняет статус процесса."""
+        process = await self.session.get(Process, process_id)
+        if not process:
+            raise ValueError("Process not found")
+        process.status = status
+        await self.session.commit()
+        return process
+
     async def get_order_processes(self, order_id: int) -> Sequence[Process]:
         result = await self.session.execute(
             select(Process)
@@ -52,13 +84,30 @@ class QueueService:
 
         action = Action(
             process_id=process_id,
-            queue=(max_queue or 0) + 1
+            queue=(max_queue or 0) + settings.QUEUE_RANK_STEP
         )
 
         self.session.add(action)
         await self.session.commit()
         return action
 
+    async def remove_action(self, action_id: int):
+        """Удаляет действие."""
+        action = await self.session.get(Action, action_id)
+        if not action:
+            raise ValueError("Action not found")
+        await self.session.delete(action)
+        await self.session.commit()
+
+    async def set_action_status(self, action_id: int, status: str) -> Action:
+        """Меняет статус действия."""
+        action = await self.session.get(Action, action_id)
+        if not action:
+            raise ValueError("Action not found")
+        action.status = status
+        await self.session.commit()
+        return action
+
     async def get_process_actions(self, process_id: int) -> Sequence[Action]:
         result = await self.session.execute(
             select(Action)
@@ -72,7 +121,8 @@ class QueueService:
         process_id: int,
         new_position: int
     ):
-        process = await self.session.get(Process, process_id)
+        process = await self.session.get(
+            Process, process_id, populate_existing=True)
         if not process:
             raise ValueError("Process not found")
 
@@ -80,9 +130,8 @@ class QueueService:
             model=Process,
             parent_id_attr="order_id",
             parent_id=process.order_id,
-            current_pos=process.queue,
-            new_pos=new_position,
-            item_id=process_id
+            item=process,
+            new_pos=new_position
         )
 
     async def move_action_in_process_queue(
@@ -90,7 +139,8 @@ class QueueService:
         action_id: int,
         new_position: int
     ):
-        action = await self.session.get(Action, action_id)
+        action = await self.session.get(
+            Action, action_id, populate_existing=True)
         if not action:
             raise ValueError("Action not found")
 
@@ -98,9 +148,8 @@ class QueueService:
             model=Action,
             parent_id_attr="process_id",
             parent_id=action.process_id,
-            current_pos=action.queue,
-            new_pos=new_position,
-            item_id=action_id
+            item=action,
+            new_pos=new_position
         )
 
     async def _move_in_queue(
@@ -108,57 +157,200 @@ class QueueService:
         model,
         parent_id_attr: str,
         parent_id: int,
-        current_pos: int,
-        new_pos: int,
-        item_id: int
+        item,
+        new_pos: int
     ):
+        """
+        Перемещает элемент на позицию new_pos (с 1) внутри родителя.
+
+        queue хранит разреженный ранг, поэтому элемент получает ранг между
+        соседями на новом месте и обновляется одна строка. Если между
+        соседями не осталось свободного ранга, очередь перенумеровывается.
+        """
         if new_pos < 1:
             raise ValueError("Position must be positive")
 
-        async with self.session.begin():
-            # Получаем максимальную позицию
-            max_pos = await self.session.scalar(
-                select(func.max(model.queue))
-                .where(getattr(model, parent_id_attr) == parent_id)
-            )
-
-            if (
-                new_pos is not None
-                and max_pos is not None
-                and new_pos > max_pos
-            ):
-                new_pos = max_pos
-
-            if current_pos == new_pos:
-                return
-
-            # Сдвигаем элементы
-            if new_pos > current_pos:
-                # Вниз
-                await self.session.execute(
-                    update(model)
-                    .where(
-                        (getattr(model, parent_id_attr) == parent_id) &
-                        (model.queue > current_pos) &
-                        (model.queue <= new_pos)
-                    )
-                    .values(queue=model.queue - 1)
-                )
-            else:
-                # Вверх
-                await self.session.execute(
-                    update(model)
-                    .where(
-                        (getattr(model, parent_id_attr) == parent_id) &
-                        (model.queue >= new_pos) &
-                        (model.queue < current_pos)
-                    )
-                    .values(queue=model.queue + 1)
-                )
-
-            # Устанавливаем новую позицию
-            await self.session.execute(
-                update(model)
-                .where(model.id == item_id)
-                .values(queue=new_pos)
-            )
+        try:
+            placed = await self._place_in_queue(
+                model, parent_id_attr, parent_id, item, new_pos)
+        except IntegrityError:
+            # Одновременный перенос занял тот же ранг между теми же соседями —
+            # перечитываем соседей и пробуем ещё раз
+            await self.session.rollback()
+            await self.session.refresh(item)
+            logger.warning(
+                f"Ранг {model.__name__} {item.id} занят параллельным "
+                f"переносом, повторяем")
+            placed = await self._place_in_queue(
+                model, parent_id_attr, parent_id, item, new_pos)
+        if placed is None:
+            return
+        lower, upper, rank = placed
+        set_committed_value(item, "queue", rank)
+
+        # Свободные ранги рядом закончились — перенумеровываем заранее в фоне
+        if rank - lower < 2 or (upper is not None and upper - rank < 2):
+            schedule_rebalance(model, parent_id_attr, parent_id)
+
+    async def _place_in_queue(
+        self,
+        model,
+        parent_id_attr: str,
+        parent_id: int,
+        item,
+        new_pos: int
+    ) -> tuple[int, int | None, int] | None:
+        """
+        Записывает элементу ранг для позиции new_pos и фиксирует транзакцию.
+
+        Возвращает ранги соседей и новый ранг; None, если элемент уже стоит
+        на этом месте.
+        """
+        parent_filter = getattr(model, parent_id_attr) == parent_id
+        others = await self.session.scalar(
+            select(func.count(model.id))
+            .where(parent_filter & (model.id != item.id))
+        )
+        new_pos = min(new_pos, others + 1)
+
+        lower, upper = await self._neighbour_ranks(
+            model, parent_filter, item.id, new_pos)
+        if item.queue is not None and lower < item.queue and (
+            upper is None or item.queue < upper
+        ):
+            # Элемент уже стоит на этом месте
+            return None
+
+        if upper is not None and upper - lower < 2:
+            await self.rebalance(model, parent_id_attr, parent_id)
+            lower, upper = await self._neighbour_ranks(
+                model, parent_filter, item.id, new_pos)
+
+        if upper is None:
+            rank = lower + settings.QUEUE_RANK_STEP
+        else:
+            rank = (lower + upper) // 2
+
+        await self.session.execute(
+            update(model)
+            .where(model.id == item.id)
+            .values(queue=rank)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return lower, upper, rank
+
+    async def _neighbour_ranks(
+        self,
+        model,
+        parent_filter,
+        item_id: int,
+        position: int
+    ) -> tuple[int, int | None]:
+        """Ранги элементов, между которыми окажется элемент на position."""
+        ranks = (await self.session.scalars(
+            select(model.queue)
+            .where(parent_filter & (model.id != item_id))
+            .order_by(model.queue)
+            .offset(max(position - 2, 0))
+            .limit(2)
+        )).all()
+        if position == 1:
+            return 0, ranks[0] if ranks else None
+        return ranks[0], ranks[1] if len(ranks) > 1 else None
+
+    async def rebalance(self, model, parent_id_attr: str, parent_id: int):
+        """Перенумеровывает очередь родителя рангами с шагом QUEUE_RANK_STEP."""
+        parent_filter = getattr(model, parent_id_attr) == parent_id
+        ids = (await self.session.scalars(
+            select(model.id).where(parent_filter).order_by(model.queue)
+        )).all()
+        if not ids:
+            return
+        await self._write_ranks(model, parent_id_attr, parent_id, ids)
+        logger.info(
+            f"Очередь {model.__name__} родителя {parent_id} "
+            f"перенумерована: {len(ids)} элементов")
+
+    async def apply_order(
+        self,
+        model,
+        parent_id: int,
+        ordered_ids: Sequence[int]
+    ):
+        """
+        Устанавливает новый порядок всех элементов родителя одной транзакцией:
+        действий процесса (model=Action) или процессов заказа (model=Process).
+
+        ordered_ids должен содержать каждый элемент родителя ровно один раз.
+        Независимо от длины очереди выполняется три запроса.
+        """
+        parent_id_attr = QUEUE_PARENTS[model]
+        current_ids = (await self.session.scalars(
+            select(model.id)
+            .where(getattr(model, parent_id_attr) == parent_id)
+        )).all()
+        if (
+            len(ordered_ids) != len(current_ids)
+            or set(ordered_ids) != set(current_ids)
+        ):
+            raise ValueError(
+                "Order must list every item of the parent exactly once")
+        if ordered_ids:
+            await self._write_ranks(model, parent_id_attr, parent_id, ordered_ids)
+        await self.session.commit()
+
+    async def _write_ranks(
+        self,
+        model,
+        parent_id_attr: str,
+        parent_id: int,
+        ordered_ids: Sequence[int]
+    ):
+        """
+        Записывает элементам ранги с шагом QUEUE_RANK_STEP в порядке
+        ordered_ids.
+
+        Сначала ранги записываются с обратным знаком, затем знак меняется
+        одним запросом, чтобы не нарушить уникальность (parent, queue)
+        посреди обновления.
+        """
+        table = model.__table__
+        await self.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("_pk"))
+            .values(queue=bindparam("rank")),
+            [
+                {"_pk": item_id, "rank": -(index * settings.QUEUE_RANK_STEP)}
+                for index, item_id in enumerate(ordered_ids, start=1)
+            ]
+        )
+        await self.session.execute(
+            update(table)
+            .where(getattr(table.c, parent_id_attr) == parent_id)
+            .values(queue=-table.c.queue)
+        )
+
+
+# Фоновые задачи перенумерации; ссылки держим, чтобы задачи не собрал GC
+_rebalance_tasks: dict[tuple, asyncio.Task] = {}
+
+
+def schedule_rebalance(model, parent_id_attr: str, parent_id: int):
+    """Запускает перенумерацию очереди родителя в фоне в отдельной сессии."""
+    key = (model.__name__, parent_id)
+    if key in _rebalance_tasks:
+        return
+
+    async def run():
+        try:
+            async with engines.write_session_maker() as session:
+                await QueueService(session).rebalance(
+                    model, parent_id_attr, parent_id)
+                await session.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при фоновой перенумерации очереди: {e}")
+        finally:
+            _rebalance_tasks.pop(key, None)
+
+    _rebalance_tasks[key] = asyncio.create_task(run())
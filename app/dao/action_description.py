@@ -4,3 +4,4 @@ from app.models.models import ActionDescription
 
 class ActionDescriptionDAO(BaseDAO[ActionDescription]):
     model = ActionDescription
+    versioned = True
@@ -1,17 +1,56 @@
-from typing import List, TypeVar, Generic, Type
+import random
+from typing import AsyncIterator, List, Mapping, Sequence, TypeVar, Generic, Type
 from pydantic import BaseModel
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.future import select
-from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, func
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy import (
+    insert as sqlalchemy_insert,
+    update as sqlalchemy_update,
+    delete as sqlalchemy_delete,
+    func,
+    and_,
+    or_,
+    type_coerce,
+    bindparam,
+    String,
+)
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.exceptions import InvalidCursorException
+from app.schemas.pagination import Page
 from .database import Base
+from .loaders import LoaderProfile, loader_options
+from .pagination import Cursor, encode_cursor, decode_cursor
+from .records import select_columns, to_records
+from .versions import bump_table_versions
 
 T = TypeVar("T", bound=Base)
 
+# Поля, по которым допускается keyset-пагинация
+PAGINATION_KEYS = ("id", "created_at")
+
+
+def _log_event(message: str, sampled: bool = False, **fields):
+    """
+    Событие DAO уровня DEBUG. Поля попадают в extra записи и подставляются
+    в сообщение, только если DEBUG для app.dao включён. Частые события
+    чтения (sampled=True) пишутся с вероятностью LOG_DAO_SAMPLE_RATE.
+    """
+    if sampled and random.random() >= settings.LOG_DAO_SAMPLE_RATE:
+        return
+    logger.opt(depth=1).debug(message, **fields)
+
 
 class BaseDAO(Generic[T]):
     model: Type[T] = None
+    # Увеличивать версию таблицы при записи: нужно только таблицам, по
+    # версиям которых страницы вычисляют ETag (см. table_etag)
+    versioned: bool = False
 
     def __init__(self, session: AsyncSession):
         """
@@ -21,83 +60,364 @@ class BaseDAO(Generic[T]):
         if self.model is None:
             raise ValueError("Модель должна быть указана в дочернем классе")
 
-    async def find_one_or_none_by_id(self, data_id: int):
+    async def _bump_version(self):
+        if self.versioned:
+            await bump_table_versions(self._session, self.model)
+
+    def _select(self, load: LoaderProfile | None = None):
+        """SELECT модели с опциями загрузки связей из профиля load."""
+        query = select(self.model)
+        if load is not None:
+            query = query.options(*loader_options(self.model, load))
+        return query
+
+    async def find_one_or_none_by_id(
+        self,
+        data_id: int,
+        load: LoaderProfile | None = None,
+    ):
         """
         Возвращает одну запись по ID или None, если не найдена.
+        load — профиль загрузки связей (см. loader_options).
         """
         try:
-            query = select(self.model).filter_by(id=data_id)
+            query = self._select(load).filter_by(id=data_id)
             result = await self._session.execute(query)
             record = result.scalar_one_or_none()
-            log_message = f"Запись {self.model.__name__} с ID {data_id} {'найдена' if record else 'не найдена'}."
-            logger.info(log_message)
+            _log_event(
+                "Запись {model} с ID {id}: найдена={found}", sampled=True,
+                model=self.model.__name__, id=data_id, found=record is not None)
             return record
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при поиске записи с ID {data_id}: {e}")
             raise
 
-    async def find_one_or_none(self, filters: BaseModel):
+    async def find_one_or_none(
+        self,
+        filters: BaseModel,
+        load: LoaderProfile | None = None,
+    ):
         """
         Возвращает одну запись по фильтрам или None, если не найдена.
         """
         filter_dict = filters.model_dump(exclude_unset=True)
-        logger.info(f"Поиск одной записи {self.model.__name__} по фильтрам: {filter_dict}")
         try:
-            query = select(self.model).filter_by(**filter_dict)
+            query = self._select(load).filter_by(**filter_dict)
             result = await self._session.execute(query)
             record = result.scalar_one_or_none()
-            log_message = f"Запись {'найдена' if record else 'не найдена'} по фильтрам: {filter_dict}"
-            logger.info(log_message)
+            _log_event(
+                "Запись {model} по фильтрам {filters}: найдена={found}",
+                sampled=True, model=self.model.__name__, filters=filter_dict,
+                found=record is not None)
             return record
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при поиске записи по фильтрам {filter_dict}: {e}")
             raise
 
-    async def find_all(self, filters: BaseModel | None = None):
+    async def find_all(
+        self,
+        filters: BaseModel | None = None,
+        load: LoaderProfile | None = None,
+    ):
         """
         Возвращает список всех записей, соответствующих фильтрам.
         """
         filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
-        logger.info(f"Поиск всех записей {self.model.__name__} по фильтрам: {filter_dict}")
         try:
-            query = select(self.model).filter_by(**filter_dict)
+            query = self._select(load).filter_by(**filter_dict)
             result = await self._session.execute(query)
             records = result.scalars().all()
-            logger.info(f"Найдено {len(records)} записей.")
+            _log_event(
+                "Найдено {rows} записей {model} по фильтрам {filters}",
+                sampled=True, model=self.model.__name__, filters=filter_dict,
+                rows=len(records))
             return records
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при поиске всех записей по фильтрам {filter_dict}: {e}")
             raise
 
+    def _filter_clauses(self, filter_dict: dict) -> list:
+        # В отличие от filter_by, условия не зависят от присоединённых таблиц
+        return [
+            getattr(self.model, name) == value
+            for name, value in filter_dict.items()
+        ]
+
+    async def find_rows(
+        self,
+        filters: BaseModel | None = None,
+        fields: Sequence[str] | None = None,
+        joined: Mapping[str, ColumnElement] | None = None,
+        order_by: Sequence[ColumnElement] = (),
+        limit: int | None = None,
+    ) -> list:
+        """
+        Возвращает записи только для чтения через Core SELECT, минуя identity
+        map, инструментирование атрибутов и жадную загрузку связей.
+
+        Записи — namedtuple с полями fields (по умолчанию все колонки таблицы)
+        и колонками связанных таблиц из joined, например
+        joined={"client_name": Clients.name} для заказов.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        try:
+            query, names = select_columns(self.model, fields, joined)
+            query = (
+                query
+                .where(*self._filter_clauses(filter_dict))
+                .order_by(*(order_by or [self.model.id]))
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            result = await self._session.execute(query)
+            rows = to_records(f"{self.model.__name__}Row", names, result)
+            _log_event(
+                "Найдено {rows} строк {model} по фильтрам {filters}",
+                sampled=True, model=self.model.__name__, filters=filter_dict,
+                fields=names, rows=len(rows))
+            return rows
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при чтении строк по фильтрам {filter_dict}: {e}")
+            raise
+
+    async def paginate(
+        self,
+        filters: BaseModel | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        order_by: str = "id",
+        descending: bool = False,
+        options: Sequence[ExecutableOption] = (),
+        fields: Sequence[str] | None = None,
+        joined: Mapping[str, ColumnElement] | None = None,
+        records: bool = False,
+        load: LoaderProfile | None = None,
+    ) -> Page:
+        """
+        Возвращает страницу записей с keyset-пагинацией.
+
+        Вместо OFFSET выборка продолжается от ключа (order_by, id) последней
+        показанной записи, поэтому стоимость страницы не зависит от её номера.
+
+        Если заданы fields или joined, выбираются только эти колонки (см.
+        find_rows) без создания ORM-объектов, а элементы страницы — словари
+        или, при records=True, записи find_rows. Иначе load задаёт профиль
+        загрузки связей объектов страницы.
+        """
+        if order_by not in PAGINATION_KEYS:
+            raise ValueError(f"Пагинация по полю {order_by} не поддерживается")
+        as_rows = fields is not None or joined is not None or records
+        if as_rows:
+            base_query, names = select_columns(self.model, fields, joined)
+        else:
+            base_query, names = self._select(load), None
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        limit = max(1, min(limit or settings.PAGE_SIZE, settings.PAGE_SIZE_MAX))
+        state = decode_cursor(cursor) if cursor else None
+        if state is not None and state.order_by != order_by:
+            raise InvalidCursorException
+        backwards = state is not None and state.backwards
+
+        # created_at сравнивается в том виде, в котором он хранится в БД
+        id_column = self.model.id
+        key_column = (
+            id_column if order_by == "id"
+            else type_coerce(getattr(self.model, order_by), String)
+        )
+        # Назад идём в обратном порядке и разворачиваем результат
+        reverse = descending != backwards
+        try:
+            query = (
+                base_query
+                .add_columns(
+                    id_column.label("cursor_id"),
+                    key_column.label("cursor_key"),
+                )
+                .where(*self._filter_clauses(filter_dict))
+                .options(*options)
+                .order_by(
+                    *([key_column.desc(), id_column.desc()] if reverse
+                      else [key_column.asc(), id_column.asc()])
+                )
+                .limit(limit + 1)
+            )
+            if state is not None:
+                if order_by == "id":
+                    seek = id_column < state.id if reverse else id_column > state.id
+                elif reverse:
+                    seek = or_(key_column < state.key,
+                               and_(key_column == state.key, id_column < state.id))
+                else:
+                    seek = or_(key_column > state.key,
+                               and_(key_column == state.key, id_column > state.id))
+                query = query.where(seek)
+            result = await self._session.execute(query)
+            rows = result.all()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при получении страницы записей {filter_dict}: {e}")
+            raise
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+
+        def make_cursor(row, to_back: bool) -> str:
+            return encode_cursor(
+                Cursor(order_by, row.cursor_key, row.cursor_id, to_back))
+
+        next_cursor = prev_cursor = None
+        if rows:
+            if has_more or backwards:
+                next_cursor = make_cursor(rows[-1], False)
+            if (has_more and backwards) or (state is not None and not backwards):
+                prev_cursor = make_cursor(rows[0], True)
+        _log_event(
+            "Страница записей {model} по фильтрам {filters}: {rows} из {limit}",
+            sampled=True, model=self.model.__name__, filters=filter_dict,
+            cursor=state, limit=limit, rows=len(rows))
+        if records:
+            items = to_records(f"{self.model.__name__}Row", names,
+                               (row[:len(names)] for row in rows))
+        elif as_rows:
+            items = [dict(zip(names, row)) for row in rows]
+        else:
+            items = [row[0] for row in rows]
+        return Page(
+            items=items,
+            limit=limit,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    async def stream(
+        self,
+        filters: BaseModel | None = None,
+        batch_size: int | None = None,
+        load: LoaderProfile | None = None,
+    ) -> AsyncIterator[T]:
+        """
+        Асинхронно перебирает все записи, соответствующие фильтрам.
+
+        Записи читаются серверным курсором пачками по batch_size, поэтому
+        расход памяти не зависит от размера таблицы.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        _log_event(
+            "Потоковое чтение записей {model} по фильтрам {filters}",
+            model=self.model.__name__, filters=filter_dict,
+            batch_size=batch_size)
+        try:
+            query = (
+                self._select(load)
+                .filter_by(**filter_dict)
+                .order_by(self.model.id)
+                .execution_options(yield_per=batch_size)
+            )
+            result = await self._session.stream(query)
+            async for partition in result.scalars().partitions():
+                for record in partition:
+                    yield record
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при потоковом чтении записей {filter_dict}: {e}")
+            raise
+
+    async def stream_dicts(
+        self,
+        filters: BaseModel | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Как stream(), но читает строки Core без создания ORM-объектов и
+        отдаёт их пачками уже в виде словарей (Base.to_dicts).
+        """
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        _log_event(
+            "Потоковое чтение строк {model} по фильтрам {filters}",
+            model=self.model.__name__, filters=filter_dict,
+            batch_size=batch_size)
+        table = self.model.__table__
+        try:
+            query = (
+                select(table)
+                .filter_by(**filter_dict)
+                .order_by(table.c.id)
+                .execution_options(yield_per=batch_size)
+            )
+            result = await self._session.stream(query)
+            async for partition in result.partitions():
+                yield self.model.to_dicts(partition)
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при потоковом чтении строк {filter_dict}: {e}")
+            raise
+
     async def add(self, values: BaseModel):
         """
         Добавляет одну новую запись в базу данных.
         """
         values_dict = values.model_dump(exclude_unset=True)
-        logger.info(f"Добавление записи {self.model.__name__} с параметрами: {values_dict}")
         try:
             new_instance = self.model(**values_dict)
             self._session.add(new_instance)
             await self._session.flush()
+            await self._bump_version()
             await self._session.commit()
-            logger.info(f"Запись {self.model.__name__} успешно добавлена.")
+            _log_event(
+                "Запись {model} добавлена с ID {id}",
+                model=self.model.__name__, id=new_instance.id,
+                fields=sorted(values_dict))
             return new_instance
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при добавлении записи: {e}")
             raise
 
-    async def add_many(self, instances: List[BaseModel]):
+    async def add_many(
+        self,
+        instances: List[BaseModel],
+        bulk: bool = False,
+        returning: bool = False,
+        chunk_size: int | None = None,
+    ):
         """
         Добавляет несколько новых записей в базу данных.
+
+        По умолчанию создаёт ORM-объекты и возвращает их. С bulk=True записи
+        вставляются через Core insert() пачками по chunk_size без создания
+        ORM-объектов; возвращается список новых ID (returning=True) или
+        количество вставленных записей.
         """
         values_list = [item.model_dump(exclude_unset=True) for item in instances]
-        logger.info(f"Добавление нескольких записей {self.model.__name__}. Количество: {len(values_list)}")
         try:
-            new_instances = [self.model(**values) for values in values_list]
-            self._session.add_all(new_instances)
-            logger.info(f"Успешно добавлено {len(new_instances)} записей.")
-            await self._session.flush()
-            return new_instances
+            if not bulk:
+                new_instances = [self.model(**values) for values in values_list]
+                self._session.add_all(new_instances)
+                await self._session.flush()
+                if new_instances:
+                    await self._bump_version()
+                _log_event(
+                    "Добавлено {rows} записей {model}",
+                    model=self.model.__name__, rows=len(new_instances))
+                return new_instances
+
+            chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+            query = sqlalchemy_insert(self.model)
+            new_ids = []
+            for start in range(0, len(values_list), chunk_size):
+                chunk = values_list[start:start + chunk_size]
+                if returning:
+                    result = await self._session.scalars(
+                        query.returning(self.model.id), chunk)
+                    new_ids.extend(result.all())
+                else:
+                    await self._session.execute(query, chunk)
+            if values_list:
+                await self._bump_version()
+            _log_event(
+                "Добавлено {rows} записей {model}",
+                model=self.model.__name__, rows=len(values_list), bulk=True)
+            return new_ids if returning else len(values_list)
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при добавлении нескольких записей: {e}")
             raise
@@ -108,8 +428,6 @@ class BaseDAO(Generic[T]):
         """
         filter_dict = filters.model_dump(exclude_unset=True)
         values_dict = values.model_dump(exclude_unset=True)
-        logger.info(
-            f"Обновление записей {self.model.__name__} по фильтру: {filter_dict} с параметрами: {values_dict}")
         try:
             query = (
                 sqlalchemy_update(self.model)
@@ -118,7 +436,12 @@ class BaseDAO(Generic[T]):
                 .execution_options(synchronize_session="fetch")
             )
             result = await self._session.execute(query)
-            logger.info(f"Обновлено {result.rowcount} записей.")
+            if result.rowcount:
+                await self._bump_version()
+            _log_event(
+                "Обновлено {rows} записей {model} по фильтрам {filters}",
+                model=self.model.__name__, filters=filter_dict,
+                fields=sorted(values_dict), rows=result.rowcount)
             await self._session.flush()
             return result.rowcount
         except SQLAlchemyError as e:
@@ -130,14 +453,18 @@ class BaseDAO(Generic[T]):
         Удаляет записи, соответствующие фильтрам. Требуется хотя бы один фильтр.
         """
         filter_dict = filters.model_dump(exclude_unset=True)
-        logger.info(f"Удаление записей {self.model.__name__} по фильтру: {filter_dict}")
         if not filter_dict:
             logger.error("Нужен хотя бы один фильтр для удаления.")
             raise ValueError("Нужен хотя бы один фильтр для удаления.")
         try:
             query = sqlalchemy_delete(self.model).filter_by(**filter_dict)
             result = await self._session.execute(query)
-            logger.info(f"Удалено {result.rowcount} записей.")
+            if result.rowcount:
+                await self._bump_version()
+            _log_event(
+                "Удалено {rows} записей {model} по фильтрам {filters}",
+                model=self.model.__name__, filters=filter_dict,
+                rows=result.rowcount)
             await self._session.flush()
             return result.rowcount
         except SQLAlchemyError as e:
@@ -149,42 +476,74 @@ class BaseDAO(Generic[T]):
         Возвращает количество записей, соответствующих фильтрам.
         """
         filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
-        logger.info(f"Подсчет количества записей {self.model.__name__} по фильтру: {filter_dict}")
         try:
             query = select(func.count(self.model.id)).filter_by(**filter_dict)
             result = await self._session.execute(query)
             count = result.scalar()
-            logger.info(f"Найдено {count} записей.")
+            _log_event(
+                "Подсчитано {rows} записей {model} по фильтрам {filters}",
+                sampled=True, model=self.model.__name__, filters=filter_dict,
+                rows=count)
             return count
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при подсчете записей: {e}")
             raise
 
-    async def bulk_update(self, records: List[BaseModel]):
+    async def bulk_update(
+        self,
+        records: List[BaseModel],
+        chunk_size: int | None = None,
+    ):
         """
         Массово обновляет записи по их ID.
         Каждая модель должна содержать поле 'id'.
+
+        Записи группируются по набору изменяемых полей, и каждая группа
+        обновляется одним executemany-запросом на пачку из chunk_size записей.
         """
-        logger.info(f"Массовое обновление записей {self.model.__name__}")
+        chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+        table = self.model.__table__
+        groups: dict[tuple[str, ...], list[dict]] = {}
+        for record in records:
+            record_dict = record.model_dump(exclude_unset=True)
+            if 'id' not in record_dict or len(record_dict) == 1:
+                continue
+            pk = record_dict.pop('id')
+            groups.setdefault(tuple(sorted(record_dict)), []).append(
+                {'_pk': pk, **record_dict})
+
         try:
             updated_count = 0
-            for record in records:
-                record_dict = record.model_dump(exclude_unset=True)
-                if 'id' not in record_dict:
-                    continue
-
-                update_data = {k: v for k, v in record_dict.items() if k != 'id'}
+            for columns, params in groups.items():
                 stmt = (
-                    sqlalchemy_update(self.model)
-                    .filter_by(id=record_dict['id'])
-                    .values(**update_data)
+                    sqlalchemy_update(table)
+                    .where(table.c.id == bindparam('_pk'))
+                    .values({column: bindparam(column) for column in columns})
                 )
-                result = await self._session.execute(stmt)
-                updated_count += result.rowcount
+                for start in range(0, len(params), chunk_size):
+                    result = await self._session.execute(
+                        stmt, params[start:start + chunk_size])
+                    updated_count += result.rowcount
+                self._sync_identity_map(params)
+            if updated_count:
+                await self._bump_version()
 
-            logger.info(f"Обновлено {updated_count} записей")
+            _log_event(
+                "Массово обновлено {rows} записей {model}",
+                model=self.model.__name__, rows=updated_count)
             await self._session.flush()
             return updated_count
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при массовом обновлении: {e}")
             raise
+
+    def _sync_identity_map(self, params: List[dict]):
+        """Переносит новые значения в уже загруженные в сессию объекты."""
+        identity_map = self._session.sync_session.identity_map
+        for values in params:
+            instance = identity_map.get(identity_key(self.model, values['_pk']))
+            if instance is None:
+                continue
+            for key, value in values.items():
+                if key != '_pk':
+                    set_committed_value(instance, key, value)
@@ -4,3 +4,4 @@ from app.models.models import Clients
 
 class ClientsDAO(BaseDAO[Clients]):
     model = Clients
+    versioned = True
@@ -1,22 +1,144 @@
-import uuid
 from datetime import datetime
-from decimal import Decimal
-from typing import Annotated
-from sqlalchemy import func, TIMESTAMP, Integer, inspect
-from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, declared_attr
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine, AsyncSession
+from typing import Annotated, Sequence
+from sqlalchemy import event, func, TIMESTAMP, Integer
+from sqlalchemy.orm import Mapped, Mapper, mapped_column, DeclarativeBase, declared_attr, configure_mappers
+from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine, AsyncSession, AsyncEngine
 from typing import AsyncGenerator
-from app.config import database_url
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.config import database_url, settings
+from app.core.metrics import session_lifetime
+from app.dao.query_stats import instrument_engine
+from app.dao.serializers import ModelSerializer
 
 
-engine = create_async_engine(url=database_url)
-async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: dict | None = None):
+    """
+    Выполняет PRAGMA из профиля SQLite при открытии каждого соединения.
+    Для других СУБД ничего не делает.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = settings.sqlite_pragmas if pragmas is None else pragmas
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            if isinstance(value, bool):
+                value = int(value)
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def read_only_url(url: str | URL) -> URL:
+    """
+    URL для чтения: для файловой SQLite — та же база, открытая только на
+    чтение, для остальных СУБД — исходный URL.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return url
+    return url.set(
+        database=f"file:{url.database}",
+        query={**url.query, "mode": "ro", "uri": "true"},
+    )
+
+
+class EngineRegistry:
+    """
+    Движки приложения: один на запись и один только на чтение, каждый со
+    своим пулом соединений. Создаются при старте приложения (или при первом
+    обращении) и закрываются при его завершении.
+    """
+
+    def __init__(self):
+        self._write_engine: AsyncEngine | None = None
+        self._read_engine: AsyncEngine | None = None
+        self._write_session_maker: async_sessionmaker | None = None
+        self._read_session_maker: async_sessionmaker | None = None
+
+    def start(self):
+        if self._write_engine is not None:
+            return
+        self._write_engine = create_async_engine(
+            url=database_url,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+        apply_sqlite_pragmas(self._write_engine)
+        instrument_engine(self._write_engine)
+
+        read_url = settings.DB_READ_URL or read_only_url(database_url)
+        if read_url == make_url(database_url):
+            # Отдельной реплики нет — читаем через пишущий движок
+            self._read_engine = self._write_engine
+        else:
+            self._read_engine = create_async_engine(
+                url=read_url,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=settings.DB_READ_POOL_SIZE,
+                max_overflow=settings.DB_READ_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+            # Режим журнала и синхронизацию задаёт пишущее соединение
+            apply_sqlite_pragmas(self._read_engine, {
+                name: value for name, value in settings.sqlite_pragmas.items()
+                if name not in ("journal_mode", "synchronous")
+            })
+            instrument_engine(self._read_engine)
+
+        self._write_session_maker = async_sessionmaker(
+            self._write_engine, class_=AsyncSession, expire_on_commit=False)
+        self._read_session_maker = async_sessionmaker(
+            self._read_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def dispose(self):
+        if self._write_engine is None:
+            return
+        if self._read_engine is not self._write_engine:
+            await self._read_engine.dispose()
+        await self._write_engine.dispose()
+        self.__init__()
+
+    @property
+    def write_engine(self) -> AsyncEngine:
+        self.start()
+        return self._write_engine
+
+    @property
+    def read_engine(self) -> AsyncEngine:
+        self.start()
+        return self._read_engine
+
+    @property
+    def write_session_maker(self) -> async_sessionmaker:
+        self.start()
+        return self._write_session_maker
+
+    @property
+    def read_session_maker(self) -> async_sessionmaker:
+        self.start()
+        return self._read_session_maker
+
+
+engines = EngineRegistry()
 str_uniq = Annotated[str, mapped_column(unique=True, nullable=False)]
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_maker() as session:
-        yield session
+    with session_lifetime.time(dependency="get_session"):
+        async with engines.write_session_maker() as session:
+            yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Сессия движка только для чтения — для GET-эндпоинтов."""
+    with session_lifetime.time(dependency="get_read_session"):
+        async with engines.read_session_maker() as session:
+            yield session
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -34,6 +156,15 @@ class Base(AsyncAttrs, DeclarativeBase):
     def __tablename__(cls) -> str:
         return cls.__name__.lower() + 's'
 
+    @classmethod
+    def serializer(cls) -> ModelSerializer:
+        """Сериализатор модели, собранный при настройке её маппера."""
+        serializer = cls.__dict__.get("_serializer")
+        if serializer is None:
+            configure_mappers()
+            serializer = cls.__dict__["_serializer"]
+        return serializer
+
     def to_dict(self, exclude_none: bool = False):
         """
         Преобразует объект модели в словарь.
@@ -44,24 +175,25 @@ class Base(AsyncAttrs, DeclarativeBase):
         Returns:
             dict: Словарь с данными объекта
         """
-        result = {}
-        for column in inspect(self.__class__).columns:
-            value = getattr(self, column.key)
-
-            # Преобразование специальных типов данных
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            elif isinstance(value, Decimal):
-                value = float(value)
-            elif isinstance(value, uuid.UUID):
-                value = str(value)
-
-            # Добавляем значение в результат
-            if not exclude_none or value is not None:
-                result[column.key] = value
-
+        result = self.serializer().object_to_dict(self)
+        if exclude_none:
+            return {key: value for key, value in result.items() if value is not None}
         return result
 
+    @classmethod
+    def to_dicts(cls, rows: Sequence) -> list[dict]:
+        """
+        Преобразует в словари список объектов модели или строк Core
+        (select(Model.__table__) или выборки отдельных колонок).
+        """
+        return cls.serializer().to_dicts(rows)
+
     def __repr__(self) -> str:
         """Строковое представление объекта для удобства отладки."""
         return f"<{self.__class__.__name__}(id={self.id}, created_at={self.created_at}, updated_at={self.updated_at})>"
+
+
+@event.listens_for(Base, "mapper_configured", propagate=True)
+def compile_serializer(mapper: Mapper, class_: type[Base]):
+    # Функции сериализации генерируются один раз для каждой модели
+    class_._serializer = ModelSerializer(mapper.columns)
@@ -1,22 +1,14 @@
 from functools import wraps
 
-from app.config import database_url
+from app.dao.database import engines
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine,
-)
-
-engine = create_async_engine(url=database_url)
-async_session_maker = async_sessionmaker(engine, class_=AsyncSession)
 
 
 def connection(isolation_level=None):
     def decorator(method):
         @wraps(method)
         async def wrapper(*args, **kwargs):
-            async with async_session_maker() as session:
+            async with engines.write_session_maker() as session:
                 try:
                     # Устанавливаем уровень изоляции, если передан
                     if isolation_level:
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Literal
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import MANYTOONE
+from sqlalchemy.sql.base import ExecutableOption
+
+from app.config import settings
+
+# Стратегия загрузки связей, не перечисленных в профиле. В строгом режиме
+# обращение к незагруженной связи падает сразу, а не выполняет скрытый
+# запрос (в асинхронном коде он всё равно закончился бы MissingGreenlet)
+DEFAULT_LAZY = "raise" if settings.QUERY_STRICT else "select"
+
+LoaderProfile = Literal["minimal", "list", "detail"]
+
+
+def _owned_collections(mapper, path, seen: set) -> list[ExecutableOption]:
+    """selectinload коллекций, удаляемых каскадом вместе с объектом."""
+    options = []
+    for rel in mapper.relationships:
+        if rel.direction is MANYTOONE or not rel.cascade.delete or rel in seen:
+            continue
+        seen.add(rel)
+        loader = (path.selectinload if path is not None else selectinload)(
+            rel.class_attribute)
+        options.append(loader)
+        options += _owned_collections(rel.mapper, loader, seen)
+    return options
+
+
+@lru_cache(maxsize=None)
+def loader_options(model: type, profile: LoaderProfile) -> tuple[ExecutableOption, ...]:
+    """
+    Опции загрузки связей модели для именованного профиля:
+
+    - minimal — связи не загружаются, обращение к ним вызывает ошибку;
+    - list — связи «многие к одному» (клиент заказа, роль пользователя)
+      присоединяются JOIN, коллекции не загружаются;
+    - detail — как list, плюс все коллекции отдельными SELECT ... IN,
+      а для коллекций с каскадным удалением — и их вложенные коллекции,
+      чтобы объект можно было удалить без ленивых загрузок.
+
+    Связи, не попавшие в профиль, всегда raiseload.
+    """
+    mapper = inspect(model)
+    options: list[ExecutableOption] = []
+    if profile in ("list", "detail"):
+        options += [
+            joinedload(rel.class_attribute)
+            for rel in mapper.relationships if rel.direction is MANYTOONE
+        ]
+    if profile == "detail":
+        seen = set()
+        options += _owned_collections(mapper, None, seen)
+        options += [
+            selectinload(rel.class_attribute)
+            for rel in mapper.relationships
+            if rel.direction is not MANYTOONE and rel not in seen
+        ]
+    elif profile not in ("minimal", "list"):
+        raise ValueError(f"Неизвестный профиль загрузки: {profile}")
+    options.append(raiseload("*"))
+    return tuple(options)
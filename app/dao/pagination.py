@@ -0,0 +1,35 @@
+import base64
+import binascii
+import json
+from typing import Any, NamedTuple
+
+from app.exceptions import InvalidCursorException
+
+
+class Cursor(NamedTuple):
+    """Позиция в выборке: значение ключа сортировки, ID и направление."""
+    order_by: str
+    key: Any
+    id: int
+    backwards: bool = False
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Упаковывает курсор в непрозрачную url-safe строку."""
+    raw = json.dumps(
+        [cursor.order_by, cursor.key, cursor.id, int(cursor.backwards)],
+        separators=(",", ":"),
+    ).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Распаковывает курсор, полученный от клиента."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        order_by, key, data_id, backwards = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        return Cursor(str(order_by), key, int(data_id), bool(backwards))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursorException
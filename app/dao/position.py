@@ -4,3 +4,4 @@ from app.models.models import Position
 
 class PositionDAO(BaseDAO[Position]):
     model = Position
+    versioned = True
@@ -0,0 +1,6 @@
+from app.dao.summary import WorkflowTrackedDAO
+from app.models.models import Process
+
+
+class ProcessDAO(WorkflowTrackedDAO[Process]):
+    model = Process
@@ -4,3 +4,4 @@ from app.models.models import ProcessDescription
 
 class ProcessDescriptionDAO(BaseDAO[ProcessDescription]):
     model = ProcessDescription
+    versioned = True
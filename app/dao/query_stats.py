@@ -0,0 +1,87 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+# Списки параметров IN (?, ?, ...) разной длины считаются одним запросом
+_IN_LIST = re.compile(r"\(\?(?:,\s*\?)*\)")
+
+
+class RepeatedQueryError(RuntimeError):
+    """Один и тот же запрос повторился в запросе HTTP слишком много раз."""
+
+
+class QueryStats:
+    """Число SQL-запросов и время в БД в рамках одного запроса HTTP."""
+
+    def __init__(self, repeat_limit: int, strict: bool):
+        self.repeat_limit = repeat_limit
+        self.strict = strict
+        self.count = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.db_seconds += seconds
+        shape = _IN_LIST.sub("(?)", " ".join(statement.split()))
+        self.shapes[shape] += 1
+        if self.strict and self.shapes[shape] > self.repeat_limit:
+            raise RepeatedQueryError(
+                f"Запрос выполнен {self.shapes[shape]} раз: {shape}")
+
+    def repeated(self) -> dict[str, int]:
+        """Запросы, повторившиеся больше repeat_limit раз (вероятный N+1)."""
+        return {
+            shape: times for shape, times in self.shapes.items()
+            if times > self.repeat_limit
+        }
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};'
+            f'desc="{self.count} queries"'
+        )
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """Считает SQL-запросы, выполненные внутри блока в текущем контексте."""
+    stats = QueryStats(settings.QUERY_REPEAT_LIMIT, settings.QUERY_STRICT)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Подключает к движку учёт запросов для collect_query_stats."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_started", None)
+        stats = _current.get()
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+
+def log_repeated_queries(stats: QueryStats, path: str):
+    for shape, times in stats.repeated().items():
+        logger.warning(
+            f"Возможный N+1 на {path}: запрос выполнен {times} раз: {shape}")
@@ -0,0 +1,58 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Iterable, Mapping, Sequence
+
+from sqlalchemy import Select, Table, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from .database import Base
+
+
+@lru_cache(maxsize=256)
+def record_type(name: str, fields: tuple[str, ...]) -> type:
+    """
+    Класс записи для набора колонок: namedtuple без __dict__ (__slots__ = ()),
+    поэтому запись весит как кортеж и не попадает в identity map сессии.
+    """
+    return namedtuple(name, fields)
+
+
+def to_records(name: str, fields: Sequence[str], rows: Iterable) -> list:
+    make = record_type(name, tuple(fields))._make
+    return [make(row) for row in rows]
+
+
+def select_columns(
+    model: type[Base],
+    fields: Sequence[str] | None = None,
+    joined: Mapping[str, ColumnElement] | None = None,
+) -> tuple[Select, list[str]]:
+    """
+    SELECT колонок таблицы модели (все, если fields не заданы) и колонок
+    связанных таблиц под именами из joined, например
+    {"client_name": Clients.name}. Связанные таблицы присоединяются через
+    LEFT OUTER JOIN по внешнему ключу, чтобы строки без связи не пропадали.
+    """
+    columns = model.__table__.c
+    fields = list(fields) if fields is not None else list(columns.keys())
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        raise ValueError(f"Неизвестные поля {model.__name__}: {unknown}")
+    joined = dict(joined or {})
+    clash = [name for name in joined if name in fields]
+    if clash:
+        raise ValueError(f"Имена присоединённых колонок совпадают с полями: {clash}")
+
+    from_clause = model.__table__
+    tables: list[Table] = [model.__table__]
+    for column in joined.values():
+        # Атрибуты ORM (Clients.name) приводятся к колонке таблицы
+        table = column.__clause_element__().table
+        if table not in tables:
+            from_clause = from_clause.outerjoin(table)
+            tables.append(table)
+    query = select(
+        *(columns[name] for name in fields),
+        *(column.label(name) for name, column in joined.items()),
+    ).select_from(from_clause)
+    return query, [*fields, *joined]
@@ -0,0 +1,96 @@
+from typing import Any, Callable, Iterable, Sequence
+
+from sqlalchemy import Column
+from sqlalchemy.types import Date, DateTime, Float, Numeric, Time, Uuid
+
+
+def _isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+def column_converter(column: Column) -> Callable[[Any], Any] | None:
+    """Преобразование значения колонки для JSON; None — значение как есть."""
+    column_type = column.type
+    if isinstance(column_type, (DateTime, Date, Time)):
+        return _isoformat
+    if isinstance(column_type, Numeric) and not isinstance(column_type, Float):
+        return _float
+    if isinstance(column_type, Uuid):
+        return _str
+    return None
+
+
+def _compile(
+    name: str,
+    keys: Sequence[str],
+    converters: Sequence[Callable | None],
+    access: Callable[[int, str], str],
+) -> Callable[[Any], dict]:
+    """
+    Собирает функцию вида
+    lambda source: {"id": source.id, "created_at": _c1(source.created_at)}
+    без циклов и проверок типов во время вызова.
+    """
+    namespace = {}
+    items = []
+    for index, (key, converter) in enumerate(zip(keys, converters)):
+        value = access(index, key)
+        if converter is not None:
+            namespace[f"_c{index}"] = converter
+            value = f"_c{index}({value})"
+        items.append(f"{key!r}: {value}")
+    source = f"def {name}(source):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<serializer {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+class ModelSerializer:
+    """
+    Сериализатор колонок одной модели, собранный один раз при настройке
+    маппера. Объекты и строки Core превращаются в словари генерированными
+    функциями, без inspect() и цепочки isinstance на каждое значение.
+    """
+
+    def __init__(self, columns: Iterable[Column]):
+        columns = list(columns)
+        self.keys = [column.key for column in columns]
+        self._converters = {
+            column.key: column_converter(column) for column in columns}
+        self.object_to_dict = _compile(
+            "object_to_dict",
+            self.keys,
+            [self._converters[key] for key in self.keys],
+            lambda index, key: f"source.{key}",
+        )
+        self._row_serializers: dict[tuple, Callable[[Any], dict]] = {}
+
+    def row_serializer(self, fields: Sequence[str]) -> Callable[[Any], dict]:
+        """Функция для строк Core с колонками fields (в том же порядке)."""
+        fields = tuple(fields)
+        serializer = self._row_serializers.get(fields)
+        if serializer is None:
+            serializer = self._row_serializers[fields] = _compile(
+                "row_to_dict",
+                fields,
+                [self._converters.get(field) for field in fields],
+                lambda index, key: f"source[{index}]",
+            )
+        return serializer
+
+    def to_dicts(self, rows: Sequence) -> list[dict]:
+        """Сериализует список объектов модели или строк Core."""
+        if not rows:
+            return []
+        first = rows[0]
+        fields = getattr(first, "_fields", None)
+        if fields is None:
+            return list(map(self.object_to_dict, rows))
+        return list(map(self.row_serializer(fields), rows))
@@ -0,0 +1,390 @@
+import asyncio
+from collections import Counter
+from typing import Iterable, List, Sequence
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import delete, event, func, inspect, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.dao.base import BaseDAO, T, _log_event
+from app.dao.database import engines
+from app.models.models import Action, Process, WorkflowSummary
+from app.schemas.workflow import WorkflowSummaryNode
+
+# process_id строк сводки, относящихся ко всему заказу
+ORDER_LEVEL = 0
+
+# Поле родителя отслеживаемых моделей
+TRACKED = {
+    Process: "order_id",
+    Action: "process_id",
+}
+
+_UPSERT_DIALECTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def _status_default(model) -> str:
+    return model.__table__.c.status.default.arg
+
+
+def _current(obj, attr: str):
+    value = getattr(obj, attr)
+    if value is None and attr == "status":
+        return _status_default(type(obj))
+    return value
+
+
+def _committed(obj, attr: str):
+    """Значение атрибута до изменений текущего flush."""
+    history = inspect(obj).attrs[attr].history
+    committed = history.deleted or history.unchanged
+    return committed[0] if committed else _current(obj, attr)
+
+
+def _keys(model, status: str, parent_id: int, orders: dict[int, int]) -> list[tuple]:
+    """Ключи (order_id, process_id, item, status) строк сводки элемента."""
+    if model is Process:
+        return [(parent_id, ORDER_LEVEL, "process", status)]
+    order_id = orders.get(parent_id)
+    if order_id is None:
+        return []
+    return [
+        (order_id, ORDER_LEVEL, "action", status),
+        (order_id, parent_id, "action", status),
+    ]
+
+
+def _process_orders(session: Session, connection, process_ids: set) -> dict[int, int]:
+    """order_id процессов: из identity map, а недостающие — одним запросом."""
+    orders = {}
+    for process_id in process_ids:
+        process = session.identity_map.get(identity_key(Process, process_id))
+        if process is not None and "order_id" in inspect(process).dict:
+            orders[process_id] = process.order_id
+    missing = process_ids - orders.keys()
+    if missing:
+        orders.update(connection.execute(
+            select(Process.id, Process.order_id).where(Process.id.in_(missing))
+        ).tuples().all())
+    return orders
+
+
+def apply_summary_deltas(connection, deltas: Counter):
+    """
+    Прибавляет изменения счётчиков одним UPSERT-запросом на пачку ключей
+    и удаляет опустевшие строки затронутых заказов.
+    """
+    rows = [
+        {"order_id": order_id, "process_id": process_id, "item": item,
+         "status": status, "total": delta}
+        for (order_id, process_id, item, status), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    table = WorkflowSummary.__table__
+    upsert = _UPSERT_DIALECTS[connection.dialect.name](table)
+    connection.execute(
+        upsert.on_conflict_do_update(
+            index_elements=["order_id", "process_id", "item", "status"],
+            set_={
+                "total": table.c.total + upsert.excluded.total,
+                "last_activity_at": func.now(),
+                "updated_at": func.now(),
+            },
+        ),
+        rows,
+    )
+    if any(row["total"] < 0 for row in rows):
+        connection.execute(
+            delete(table)
+            .where(table.c.order_id.in_({row["order_id"] for row in rows}))
+            .where(table.c.total <= 0)
+        )
+
+
+def _move_processes(connection, moved: dict[int, tuple[int, int]], deltas: Counter):
+    table = WorkflowSummary.__table__
+    rows = connection.execute(
+        select(table.c.process_id, table.c.status, table.c.total)
+        .where(table.c.process_id.in_(moved))
+    ).all()
+    for process_id, status, total in rows:
+        old_order, new_order = moved[process_id]
+        deltas[(old_order, ORDER_LEVEL, "action", status)] -= total
+        deltas[(new_order, ORDER_LEVEL, "action", status)] += total
+    for process_id, (_, new_order) in moved.items():
+        connection.execute(
+            update(table)
+            .where(table.c.process_id == process_id)
+            .values(order_id=new_order, updated_at=func.now())
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def track_workflow_summary(session: Session, flush_context):
+    """
+    Обновляет сводку в той же транзакции по процессам и действиям,
+    добавленным, удалённым или сменившим статус (или родителя) в этом flush.
+    """
+    new = [obj for obj in session.new if type(obj) in TRACKED]
+    deleted = [obj for obj in session.deleted if type(obj) in TRACKED]
+    dirty = [
+        obj for obj in session.dirty
+        if type(obj) in TRACKED and any(
+            inspect(obj).attrs[attr].history.has_changes()
+            for attr in ("status", TRACKED[type(obj)])
+        )
+    ]
+    if not (new or deleted or dirty):
+        return
+
+    connection = session.connection()
+    deleted_processes = {obj.id for obj in deleted if type(obj) is Process}
+    process_ids = {
+        value
+        for obj in (*new, *deleted, *dirty) if type(obj) is Action
+        for value in (_committed(obj, "process_id"), _current(obj, "process_id"))
+        if value is not None
+    } - deleted_processes
+    orders = _process_orders(session, connection, process_ids)
+
+    deltas = Counter()
+    for obj in new:
+        model = type(obj)
+        for key in _keys(model, _current(obj, "status"),
+                         _current(obj, TRACKED[model]), orders):
+            deltas[key] += 1
+    for obj in deleted:
+        model = type(obj)
+        parent_id = _committed(obj, TRACKED[model])
+        if model is Action and parent_id in deleted_processes:
+            # Учтено ниже вместе со строками удалённого процесса
+            continue
+        for key in _keys(model, _committed(obj, "status"), parent_id, orders):
+            deltas[key] -= 1
+    for obj in dirty:
+        model = type(obj)
+        parent = TRACKED[model]
+        old = _keys(model, _committed(obj, "status"), _committed(obj, parent), orders)
+        current = _keys(model, _current(obj, "status"), _current(obj, parent), orders)
+        if old != current:
+            for key in old:
+                deltas[key] -= 1
+            for key in current:
+                deltas[key] += 1
+
+    moved_processes = {
+        obj.id: (_committed(obj, "order_id"), _current(obj, "order_id"))
+        for obj in dirty
+        if type(obj) is Process
+        and _committed(obj, "order_id") != _current(obj, "order_id")
+    }
+    if moved_processes:
+        # Действия процесса переходят в другой заказ вместе с ним: строки
+        # процесса получают новый order_id, а итоги по действиям заказов
+        # переносятся из старого заказа в новый
+        _move_processes(connection, moved_processes, deltas)
+
+    if deleted_processes:
+        # Действия удалённого процесса вычитаются из сводки заказа по его
+        # собственным строкам, даже если каскад удалил их без загрузки
+        table = WorkflowSummary.__table__
+        rows = connection.execute(
+            select(table.c.order_id, table.c.process_id, table.c.status, table.c.total)
+            .where(table.c.process_id.in_(deleted_processes))
+        ).all()
+        for order_id, process_id, status, total in rows:
+            deltas[(order_id, ORDER_LEVEL, "action", status)] -= total
+        connection.execute(
+            delete(table).where(table.c.process_id.in_(deleted_processes)))
+
+    apply_summary_deltas(connection, deltas)
+
+
+def _summary_selects(order_ids: Sequence[int] | None):
+    """SELECT ... GROUP BY, строящие сводку с нуля (все заказы или order_ids)."""
+    process_query = select(
+        Process.order_id, literal(ORDER_LEVEL), literal("process"),
+        Process.status, func.count(), func.max(Process.updated_at),
+    ).group_by(Process.order_id, Process.status)
+    order_actions = select(
+        Process.order_id, literal(ORDER_LEVEL), literal("action"),
+        Action.status, func.count(), func.max(Action.updated_at),
+    ).select_from(Action).join(Process, Action.process_id == Process.id).group_by(
+        Process.order_id, Action.status)
+    process_actions = select(
+        Process.order_id, Action.process_id, literal("action"),
+        Action.status, func.count(), func.max(Action.updated_at),
+    ).select_from(Action).join(Process, Action.process_id == Process.id).group_by(
+        Process.order_id, Action.process_id, Action.status)
+    queries = [process_query, order_actions, process_actions]
+    if order_ids is not None:
+        queries = [query.where(Process.order_id.in_(order_ids)) for query in queries]
+    return queries
+
+
+class WorkflowSummaryDAO(BaseDAO[WorkflowSummary]):
+    model = WorkflowSummary
+
+    async def rebuild(self, order_ids: Iterable[int] | None = None) -> int:
+        """
+        Пересчитывает сводку с нуля массовыми INSERT ... SELECT: целиком
+        или только для заказов order_ids. Не коммитит.
+        """
+        order_ids = None if order_ids is None else sorted(set(order_ids))
+        if order_ids == []:
+            return 0
+        table = WorkflowSummary.__table__
+        columns = ["order_id", "process_id", "item", "status", "total",
+                   "last_activity_at"]
+        try:
+            query = delete(table)
+            if order_ids is not None:
+                query = query.where(table.c.order_id.in_(order_ids))
+            await self._session.execute(query)
+            rows = 0
+            for select_query in _summary_selects(order_ids):
+                result = await self._session.execute(
+                    table.insert().from_select(columns, select_query))
+                rows += result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при пересчёте сводки заказов: {e}")
+            raise
+        _log_event(
+            "Сводка заказов пересчитана: {rows} строк",
+            orders=order_ids, rows=rows)
+        return rows
+
+    async def _load(self, column, ids: Sequence[int], process_level: bool) -> dict:
+        table = WorkflowSummary.__table__
+        query = select(
+            column, table.c.item, table.c.status, table.c.total,
+            table.c.last_activity_at,
+        ).where(column.in_(ids))
+        query = query.where(
+            table.c.process_id != ORDER_LEVEL if process_level
+            else table.c.process_id == ORDER_LEVEL)
+        summaries: dict[int, dict] = {}
+        for key, item, status, total, last_activity_at in await self._session.execute(query):
+            summary = summaries.setdefault(
+                key, {"processes": {}, "actions": {}, "last_activity_at": None})
+            summary["processes" if item == "process" else "actions"][status] = total
+            if summary["last_activity_at"] is None or (
+                last_activity_at is not None
+                and last_activity_at > summary["last_activity_at"]
+            ):
+                summary["last_activity_at"] = last_activity_at
+        return {key: WorkflowSummaryNode(**value) for key, value in summaries.items()}
+
+    async def for_orders(self, order_ids: Sequence[int]) -> dict[int, WorkflowSummaryNode]:
+        """Сводки заказов одним запросом; у заказов без процессов сводки нет."""
+        if not order_ids:
+            return {}
+        return await self._load(WorkflowSummary.order_id, order_ids, False)
+
+    async def for_processes(self, process_ids: Sequence[int]) -> dict[int, WorkflowSummaryNode]:
+        """Сводки действий процессов одним запросом."""
+        if not process_ids:
+            return {}
+        return await self._load(WorkflowSummary.process_id, process_ids, True)
+
+
+class WorkflowTrackedDAO(BaseDAO[T]):
+    """
+    DAO процессов и действий. Изменения через ORM попадают в сводку при
+    flush; массовые Core-запросы BaseDAO его обходят, поэтому после них
+    сводка затронутых заказов пересчитывается в той же транзакции.
+    """
+
+    def _orders_query(self):
+        query = select(Process.order_id).distinct()
+        if self.model is Action:
+            query = query.join(Action, Action.process_id == Process.id)
+        return query
+
+    async def _affected_orders(self, *clauses) -> set[int]:
+        return set((await self._session.scalars(
+            self._orders_query().where(*clauses))).all())
+
+    async def _parent_orders(self, values: Iterable[dict]) -> set[int]:
+        parent = TRACKED[self.model]
+        parent_ids = {item[parent] for item in values if item.get(parent) is not None}
+        if not parent_ids:
+            return set()
+        if self.model is Process:
+            return parent_ids
+        return set((await self._session.scalars(
+            select(Process.order_id).distinct()
+            .where(Process.id.in_(parent_ids)))).all())
+
+    async def _rebuild(self, order_ids: set[int]):
+        await WorkflowSummaryDAO(self._session).rebuild(order_ids)
+
+    async def update(self, filters: BaseModel, values: BaseModel):
+        filter_dict = filters.model_dump(exclude_unset=True)
+        order_ids = await self._affected_orders(*self._filter_clauses(filter_dict))
+        order_ids |= await self._parent_orders([values.model_dump(exclude_unset=True)])
+        rowcount = await super().update(filters, values)
+        if rowcount:
+            await self._rebuild(order_ids)
+        return rowcount
+
+    async def delete(self, filters: BaseModel):
+        filter_dict = filters.model_dump(exclude_unset=True)
+        order_ids = await self._affected_orders(*self._filter_clauses(filter_dict))
+        rowcount = await super().delete(filters)
+        if rowcount:
+            await self._rebuild(order_ids)
+        return rowcount
+
+    async def bulk_update(
+        self,
+        records: List[BaseModel],
+        chunk_size: int | None = None,
+    ):
+        values = [record.model_dump(exclude_unset=True) for record in records]
+        ids = [item["id"] for item in values if "id" in item]
+        order_ids = set()
+        if ids:
+            order_ids = await self._affected_orders(self.model.id.in_(ids))
+        order_ids |= await self._parent_orders(values)
+        updated_count = await super().bulk_update(records, chunk_size)
+        if updated_count:
+            await self._rebuild(order_ids)
+        return updated_count
+
+    async def add_many(
+        self,
+        instances: List[BaseModel],
+        bulk: bool = False,
+        returning: bool = False,
+        chunk_size: int | None = None,
+    ):
+        result = await super().add_many(instances, bulk, returning, chunk_size)
+        if bulk and instances:
+            await self._rebuild(await self._parent_orders(
+                item.model_dump(exclude_unset=True) for item in instances))
+        return result
+
+
+async def rebuild_workflow_summary() -> int:
+    """Полный пересчёт сводки одной транзакцией."""
+    async with engines.write_session_maker() as session:
+        rows = await WorkflowSummaryDAO(session).rebuild()
+        await session.commit()
+    await engines.dispose()
+    logger.info(f"Сводка заказов пересчитана: {rows} строк")
+    return rows
+
+
+if __name__ == "__main__":
+    # python -m app.dao.summary — сверка сводки после ручных правок в БД
+    asyncio.run(rebuild_workflow_summary())
@@ -0,0 +1,40 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import TableVersion
+
+
+async def bump_table_versions(session: AsyncSession, *models):
+    """
+    Увеличивает версии таблиц в текущей транзакции сессии, так что новая
+    версия становится видна вместе с изменёнными данными.
+    """
+    for model in models:
+        name = model.__tablename__
+        query = (
+            update(TableVersion)
+            .where(TableVersion.name == name)
+            .values(version=TableVersion.version + 1)
+        )
+        result = await session.execute(query)
+        if result.rowcount:
+            continue
+        try:
+            async with session.begin_nested():
+                await session.execute(
+                    insert(TableVersion).values(name=name, version=1))
+        except IntegrityError:
+            # Строку версии успела создать другая транзакция
+            await session.execute(query)
+
+
+async def get_table_versions(session: AsyncSession, *models) -> tuple[int, ...]:
+    """Текущие версии таблиц одним запросом; у неизменявшихся таблиц — 0."""
+    names = [model.__tablename__ for model in models]
+    rows = await session.execute(
+        select(TableVersion.name, TableVersion.version)
+        .where(TableVersion.name.in_(names))
+    )
+    versions = dict(rows.tuples().all())
+    return tuple(versions.get(name, 0) for name in names)
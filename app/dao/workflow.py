@@ -0,0 +1,99 @@
+from collections import defaultdict
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.dao.base import BaseDAO, _log_event
+from app.dao.records import select_columns
+from app.models.models import (
+    Action,
+    ActionDescription,
+    Clients,
+    Orders,
+    Process,
+    ProcessDescription,
+)
+from app.schemas.workflow import ActionNode, ClientNode, OrderTree, ProcessNode
+
+PROCESS_FIELDS = (
+    "id", "queue", "status", "coordinator_user_id", "process_description_id")
+ACTION_FIELDS = (
+    "id", "process_id", "queue", "status", "implementer_user_id",
+    "actions_description_id")
+
+
+class WorkflowTreeDAO(BaseDAO[Orders]):
+    """Заказ целиком: клиент, процессы, действия и их описания."""
+    model = Orders
+
+    async def load_order(self, order_id: int) -> OrderTree | None:
+        """
+        Загружает дерево заказа не более чем тремя запросами, сколько бы
+        в нём ни было процессов и действий: заказ с клиентом, процессы
+        заказа с описаниями, действия всех процессов с описаниями.
+        Возвращает None, если заказа нет.
+        """
+        try:
+            order_query, _ = select_columns(
+                Orders,
+                ["id", "number", "description", "user_id", "created_at", "client_id"],
+                {"client_name": Clients.name},
+            )
+            order = (await self._session.execute(
+                order_query.where(Orders.id == order_id))).one_or_none()
+            if order is None:
+                return None
+
+            process_query, _ = select_columns(Process, PROCESS_FIELDS, {
+                "name": ProcessDescription.name,
+                "description": ProcessDescription.description,
+            })
+            processes = (await self._session.execute(
+                process_query
+                .where(Process.order_id == order_id)
+                .order_by(Process.queue)
+            )).all()
+
+            actions_by_process = defaultdict(list)
+            if processes:
+                action_query, _ = select_columns(Action, ACTION_FIELDS, {
+                    "name": ActionDescription.name,
+                    "description": ActionDescription.description,
+                })
+                actions = await self._session.execute(
+                    action_query
+                    .where(Action.process_id.in_(
+                        select(Process.id).where(Process.order_id == order_id)))
+                    .order_by(Action.process_id, Action.queue)
+                )
+                for action in actions:
+                    actions_by_process[action.process_id].append(
+                        ActionNode(**action._asdict()))
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при загрузке дерева заказа {order_id}: {e}")
+            raise
+
+        tree = OrderTree(
+            id=order.id,
+            number=order.number,
+            description=order.description,
+            user_id=order.user_id,
+            created_at=order.created_at,
+            client=(
+                ClientNode(id=order.client_id, name=order.client_name)
+                if order.client_name is not None else None
+            ),
+            processes=tuple(
+                ProcessNode(
+                    **process._asdict(),
+                    actions=tuple(actions_by_process[process.id]),
+                )
+                for process in processes
+            ),
+        )
+        _log_event(
+            "Дерево заказа {id}: {processes} процессов", sampled=True,
+            id=order_id, processes=len(tree.processes),
+            actions=sum(len(actions) for actions in actions_by_process.values()))
+        return tree
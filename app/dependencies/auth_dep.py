@@ -1,13 +1,17 @@
 from datetime import datetime, timezone
 from fastapi import Request, Depends, HTTPException
 from jose import jwt, JWTError, ExpiredSignatureError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.utils import redirect_or_raise
 from app.auth.dao import UsersDAO
+from app.auth.utils import create_tokens, token_claims
 from app.models.models import User
 from app.config import settings
+from app.dao.database import get_read_session
 from app.dependencies.dao_dep import get_session_without_commit
+from app.schemas.auth import SUserClaims
 
 from app.exceptions import (
     TokenNoFound,
@@ -52,11 +56,25 @@ async def check_refresh_token(
         redirect_or_raise(request, NoJwtException)
 
 
-async def get_current_user(
+def get_access_claims(request: Request) -> SUserClaims | None:
+    """Пользователь из действующего access-токена или None."""
+    token = get_access_token(request)
+    if token is None:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("type") != "access":
+            return None
+        return SUserClaims.model_validate(payload)
+    except (JWTError, ValidationError):
+        return None
+
+
+async def get_user_by_refresh_token(
     request: Request,
-    token: str = Depends(get_refresh_token),
-    session: AsyncSession = Depends(get_session_without_commit)
-):
+    token: str,
+    session: AsyncSession,
+) -> User:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except ExpiredSignatureError:
@@ -76,17 +94,56 @@ async def get_current_user(
     if user_id is None:
         redirect_or_raise(request, NoUserIdException)
 
-    user = await UsersDAO(session).find_one_or_none_by_id(data_id=int(user_id))
+    user = await UsersDAO(session).find_one_or_none_by_id(
+        data_id=int(user_id), load="list")
     if not user:
         redirect_or_raise(request, TokenNoFound)
-    else:
-        return user
+    return user
 
 
-async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
+async def get_current_user(
+    request: Request,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Текущий пользователь.
+
+    В режиме AUTH_STATELESS пользователь берётся из claims access-токена без
+    обращения к БД. К БД идём только когда access-токен отсутствует или истёк:
+    пользователь загружается по refresh-токену, а новая пара токенов
+    выставляется в куки ответа через refresh_tokens_middleware.
+    """
+    if settings.AUTH_STATELESS:
+        claims = get_access_claims(request)
+        if claims is not None:
+            return claims
+
+    user = await get_user_by_refresh_token(
+        request, get_refresh_token(request), session)
+    if settings.AUTH_STATELESS:
+        request.state.refreshed_tokens = create_tokens(data=token_claims(user))
+    return user
+
+
+async def get_current_db_user(
+    request: Request,
+    current_user: User | SUserClaims = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session)
 ) -> User:
+    """Текущий пользователь, загруженный из БД со всеми полями."""
+    if isinstance(current_user, User):
+        return current_user
+    user = await UsersDAO(session).find_one_or_none_by_id(
+        data_id=current_user.id, load="list")
+    if not user:
+        redirect_or_raise(request, UserNotFoundException)
+    return user
+
+
+async def get_current_admin_user(
+    current_user: User | SUserClaims = Depends(get_current_user)
+) -> User | SUserClaims:
     """Проверяем права пользователя как администратора."""
-    if current_user.role.id in [3, 4]:
+    if current_user.role_id in [3, 4]:
         return current_user
     raise ForbiddenException
@@ -1,28 +1,31 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dao.database import async_session_maker
+from app.core.metrics import session_lifetime
+from app.dao.database import engines
 
 
 async def get_session_with_commit() -> AsyncGenerator[AsyncSession, None]:
     """Асинхронная сессия с автоматическим коммитом."""
-    async with async_session_maker() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    with session_lifetime.time(dependency="get_session_with_commit"):
+        async with engines.write_session_maker() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
 
 
 async def get_session_without_commit() -> AsyncGenerator[AsyncSession, None]:
     """Асинхронная сессия без автоматического коммита."""
-    async with async_session_maker() as session:
-        try:
-            yield session
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    with session_lifetime.time(dependency="get_session_without_commit"):
+        async with engines.write_session_maker() as session:
+            try:
+                yield session
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
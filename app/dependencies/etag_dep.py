@@ -0,0 +1,70 @@
+import hashlib
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.templates import TEMPLATES_FINGERPRINT
+from app.dao.database import get_read_session
+from app.dao.versions import get_table_versions
+from app.dependencies.auth_dep import get_current_user
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    # Страница зависит от пользователя в куках, поэтому кеш только приватный
+    # и с обязательной перепроверкой
+    return {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Cookie",
+    }
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    response.headers.update(etag_headers(etag))
+    return response
+
+
+def matches_etag(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match сравнивается слабо: W/"x" совпадает с "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def table_etag(*models) -> Callable:
+    """
+    Зависимость для страниц справочников: вычисляет сильный ETag по версиям
+    таблиц models, адресу страницы, пользователю и шаблонам. Если ETag
+    совпал с If-None-Match, запрос завершается ответом 304 ещё до выборки
+    данных и рендеринга шаблона.
+    """
+
+    async def dependency(
+        request: Request,
+        session: AsyncSession = Depends(get_read_session),
+        user=Depends(get_current_user),
+    ) -> str:
+        versions = await get_table_versions(session, *models)
+        key = "|".join(map(str, (
+            TEMPLATES_FINGERPRINT,
+            request.url.path,
+            request.url.query,
+            versions,
+            user.id,
+            user.role_id,
+            user.position_id,
+            user.first_name,
+            user.last_name,
+        )))
+        etag = f'"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+        if matches_etag(request, etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=etag_headers(etag),
+            )
+        return etag
+
+    return dependency
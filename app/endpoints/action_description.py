@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.templates import templates
 from app.dao.action_description import ActionDescriptionDAO
 from app.dependencies.auth_dep import get_current_user
-from app.dao.database import get_session
-from app.models.models import User
+from app.dependencies.etag_dep import set_etag, table_etag
+from app.dao.versions import bump_table_versions
+from app.dao.database import get_session, get_read_session
+from app.models.models import User, ActionDescription
 from app.schemas.action_description import ActionDescriptionCreate
 
 router = APIRouter()
@@ -15,15 +17,17 @@ router = APIRouter()
 @router.get("/action_description/")
 async def action_description_page(
     request: Request,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+    etag: str = Depends(table_etag(ActionDescription))
 ):
     action_description = await ActionDescriptionDAO(session).find_all()
-    return templates.TemplateResponse("action_description/action_description.html", {
+    response = templates.TemplateResponse("action_description/action_description.html", {
         "user": user,
         "request": request,
         "action_description": action_description,
     })
+    return set_etag(response, etag)
 
 
 @router.post("/action_description/create")
@@ -54,6 +58,7 @@ async def edit_action_description(
 
     action_description.name = name
     action_description.description = description
+    await bump_table_versions(session, ActionDescription)
     await session.commit()
     return RedirectResponse(url=f"/action_description/{act_desc_id}", status_code=303)
 
@@ -62,7 +67,7 @@ async def edit_action_description(
 async def get_action_description_by_id(
     act_desc_id: int,
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(get_current_user)
 ):
     action_description = await ActionDescriptionDAO(session).find_one_or_none_by_id(act_desc_id)
@@ -85,8 +90,10 @@ async def delete_action_description(
     act_desc_id: int,
     session: AsyncSession = Depends(get_session),
 ):
-    action_description = await ActionDescriptionDAO(session).find_one_or_none_by_id(act_desc_id)
+    action_description = await ActionDescriptionDAO(session).find_one_or_none_by_id(
+        act_desc_id, load="detail")
     if action_description:
         await session.delete(action_description)
+        await bump_table_versions(session, ActionDescription)
         await session.commit()
     return RedirectResponse(url="/action_description", status_code=303)
@@ -0,0 +1,181 @@
+from typing import Type
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dao.action import ActionDAO
+from app.dao.action_description import ActionDescriptionDAO
+from app.dao.base import BaseDAO
+from app.dao.clients import ClientsDAO
+from app.dao.database import get_read_session
+from app.dao.orders import OrdersDAO
+from app.dao.position import PositionDAO
+from app.dao.process import ProcessDAO
+from app.dao.process_description import ProcessDescriptionDAO
+from app.dao.workflow import WorkflowTreeDAO
+from app.dependencies.auth_dep import get_current_user
+from app.exceptions import InvalidFieldsException, OrderNotFoundException
+from app.models.models import User
+from app.schemas.api import (
+    ActionFilter,
+    OrdersFilter,
+    ProcessDescriptionFilter,
+    ProcessFilter,
+)
+from app.schemas.workflow import OrderTree
+
+router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
+
+
+def parse_fields(dao_cls: Type[BaseDAO], fields: str | None) -> list[str]:
+    """Список колонок из параметра fields=a,b,c; без параметра — все колонки."""
+    columns = dao_cls.model.__table__.c
+    if not fields:
+        return list(columns.keys())
+    names = list(dict.fromkeys(
+        name.strip() for name in fields.split(",") if name.strip()))
+    if not names or any(name not in columns for name in names):
+        raise InvalidFieldsException
+    return names
+
+
+def filters_of(schema: Type[BaseModel], **values) -> BaseModel:
+    # В фильтр попадают только переданные параметры
+    return schema(**{name: value for name, value in values.items() if value is not None})
+
+
+async def list_response(
+    dao_cls: Type[BaseDAO],
+    session: AsyncSession,
+    fields: str | None,
+    cursor: str | None,
+    limit: int | None,
+    filters: BaseModel | None = None,
+    descending: bool = False,
+) -> dict:
+    page = await dao_cls(session).paginate(
+        filters=filters,
+        cursor=cursor,
+        limit=limit,
+        descending=descending,
+        fields=parse_fields(dao_cls, fields),
+    )
+    return {
+        "items": page.items,
+        "limit": page.limit,
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+
+
+@router.get("/clients")
+async def api_clients(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+):
+    return await list_response(ClientsDAO, session, fields, cursor, limit)
+
+
+@router.get("/positions")
+async def api_positions(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+):
+    return await list_response(PositionDAO, session, fields, cursor, limit)
+
+
+@router.get("/orders")
+async def api_orders(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    client_id: int | None = None,
+    user_id: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+):
+    return await list_response(
+        OrdersDAO, session, fields, cursor, limit,
+        filters=filters_of(OrdersFilter, client_id=client_id, user_id=user_id),
+        descending=True,
+    )
+
+
+@router.get("/orders/{order_id}/tree")
+async def api_order_tree(
+    order_id: int,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+) -> OrderTree:
+    """Заказ с клиентом, процессами и действиями за фиксированное число запросов."""
+    tree = await WorkflowTreeDAO(session).load_order(order_id)
+    if tree is None:
+        raise OrderNotFoundException
+    return tree
+
+
+@router.get("/processes")
+async def api_processes(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    order_id: int | None = None,
+    status: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+):
+    return await list_response(
+        ProcessDAO, session, fields, cursor, limit,
+        filters=filters_of(ProcessFilter, order_id=order_id, status=status),
+    )
+
+
+@router.get("/actions")
+async def api_actions(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    process_id: int | None = None,
+    status: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+):
+    return await list_response(
+        ActionDAO, session, fields, cursor, limit,
+        filters=filters_of(ActionFilter, process_id=process_id, status=status),
+    )
+
+
+@router.get("/process_descriptions")
+async def api_process_descriptions(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    position_id: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+):
+    return await list_response(
+        ProcessDescriptionDAO, session, fields, cursor, limit,
+        filters=filters_of(ProcessDescriptionFilter, position_id=position_id),
+    )
+
+
+@router.get("/action_descriptions")
+async def api_action_descriptions(
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user)
+):
+    return await list_response(
+        ActionDescriptionDAO, session, fields, cursor, limit)
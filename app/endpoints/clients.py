@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.templates import templates
 from app.dao.clients import ClientsDAO
 from app.dependencies.auth_dep import get_current_user
-from app.dao.database import get_session
-from app.models.models import User
+from app.dependencies.etag_dep import set_etag, table_etag
+from app.dao.versions import bump_table_versions
+from app.dao.database import get_session, get_read_session
+from app.models.models import User, Clients
 from app.schemas.clients import ClientsCreate
 
 router = APIRouter()
@@ -15,15 +17,20 @@ router = APIRouter()
 @router.get("/clients/")
 async def clients_page(
     request: Request,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user)
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+    etag: str = Depends(table_etag(Clients))
 ):
-    clients = await ClientsDAO(session).find_all()
-    return templates.TemplateResponse("clients/clients.html", {
+    page = await ClientsDAO(session).paginate(cursor=cursor, limit=limit)
+    response = templates.TemplateResponse("clients/clients.html", {
         "user": user,
         "request": request,
-        "clients": clients,
+        "clients": page.items,
+        "page": page,
     })
+    return set_etag(response, etag)
 
 
 @router.post("/client/create")
@@ -54,6 +61,7 @@ async def edit_client(
 
     client.name = name
     client.description = description
+    await bump_table_versions(session, Clients)
     await session.commit()
     return RedirectResponse(url=f"/client/{client_id}", status_code=303)
 
@@ -62,7 +70,7 @@ async def edit_client(
 async def get_client_by_id(
     client_id: int,
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(get_current_user)
 ):
     client = await ClientsDAO(session).find_one_or_none_by_id(client_id)
@@ -85,8 +93,10 @@ async def delete_client(
     client_id: int,
     session: AsyncSession = Depends(get_session),
 ):
-    client = await ClientsDAO(session).find_one_or_none_by_id(client_id)
+    client = await ClientsDAO(session).find_one_or_none_by_id(
+        client_id, load="detail")
     if client:
         await session.delete(client)
+        await bump_table_versions(session, Clients)
         await session.commit()
     return RedirectResponse(url="/clients", status_code=303)
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal, Type
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.dao.action import ActionDAO
+from app.dao.base import BaseDAO
+from app.dao.database import engines
+from app.dao.orders import OrdersDAO
+from app.dao.process import ProcessDAO
+from app.dependencies.auth_dep import get_current_user
+from app.models.models import User
+
+router = APIRouter()
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def _records(dao_cls: Type[BaseDAO]) -> AsyncIterator[dict]:
+    # Сессия живёт столько же, сколько и ответ: зависимость get_session
+    # закрылась бы раньше, чем будет отдана первая строка
+    async with engines.read_session_maker() as session:
+        async for batch in dao_cls(session).stream_dicts(
+            batch_size=settings.EXPORT_BATCH_SIZE
+        ):
+            for record in batch:
+                yield record
+
+
+async def _ndjson(records: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+async def _csv(
+    columns: list[str],
+    records: AsyncIterator[dict],
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    rows = 0
+    async for record in records:
+        writer.writerow(record)
+        rows += 1
+        if rows % settings.EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_response(
+    dao_cls: Type[BaseDAO],
+    export_format: ExportFormat,
+) -> StreamingResponse:
+    """Отдаёт таблицу DAO целиком потоком в формате NDJSON или CSV."""
+    records = _records(dao_cls)
+    if export_format == "csv":
+        columns = dao_cls.model.serializer().keys
+        body = _csv(columns, records)
+    else:
+        body = _ndjson(records)
+    filename = f"{dao_cls.model.__tablename__}.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/orders/export")
+async def export_orders(
+    format: ExportFormat = "ndjson",
+    user: User = Depends(get_current_user)
+):
+    return export_response(OrdersDAO, format)
+
+
+@router.get("/processes/export")
+async def export_processes(
+    format: ExportFormat = "ndjson",
+    user: User = Depends(get_current_user)
+):
+    return export_response(ProcessDAO, format)
+
+
+@router.get("/actions/export")
+async def export_actions(
+    format: ExportFormat = "ndjson",
+    user: User = Depends(get_current_user)
+):
+    return export_response(ActionDAO, format)
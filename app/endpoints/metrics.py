@@ -0,0 +1,75 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.auth.utils import password_executor
+from app.core.metrics import exposition, metrics
+from app.core.templates import templates
+from app.dao.database import engines
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics.collector
+def collect_db_pools() -> list[str]:
+    pools = {"write": engines.write_engine.pool}
+    if engines.read_engine is not engines.write_engine:
+        pools["read"] = engines.read_engine.pool
+    lines = []
+    for name, documentation, value in (
+        ("db_pool_size", "Размер пула соединений", lambda pool: pool.size()),
+        ("db_pool_checked_out", "Соединения, выданные из пула",
+         lambda pool: pool.checkedout()),
+        ("db_pool_overflow", "Соединения сверх размера пула",
+         lambda pool: max(pool.overflow(), 0)),
+    ):
+        lines += exposition(name, "gauge", documentation, (
+            ("", {"engine": engine}, value(pool))
+            for engine, pool in pools.items()
+        ))
+    return lines
+
+
+@metrics.collector
+def collect_password_executor() -> list[str]:
+    stats = password_executor.stats()
+    lines = []
+    for name, kind, documentation, value in (
+        ("password_hash_in_flight", "gauge",
+         "Задачи bcrypt, выполняемые в пуле", stats["in_flight"]),
+        ("password_hash_queued", "gauge",
+         "Задачи bcrypt, ожидающие свободного потока", stats["queued"]),
+        ("password_hash_completed_total", "counter",
+         "Выполненные задачи bcrypt", stats["completed"]),
+        ("password_hash_failed_total", "counter",
+         "Задачи bcrypt, завершившиеся ошибкой", stats["failed"]),
+        ("password_hash_rejected_total", "counter",
+         "Задачи bcrypt, отклонённые из-за заполненной очереди",
+         stats["rejected"]),
+        ("password_hash_wait_seconds_total", "counter",
+         "Суммарное ожидание задач bcrypt в очереди", stats["wait_seconds"]),
+        ("password_hash_run_seconds_total", "counter",
+         "Суммарное время вычисления bcrypt", stats["run_seconds"]),
+    ):
+        lines += exposition(name, kind, documentation, [("", {}, value)])
+    return lines
+
+
+@metrics.collector
+def collect_fragment_cache() -> list[str]:
+    cache = templates.env.fragment_cache
+    return [
+        *exposition("template_fragment_cache_hits_total", "counter",
+                    "Фрагменты шаблонов, взятые из кеша", [("", {}, cache.hits)]),
+        *exposition("template_fragment_cache_misses_total", "counter",
+                    "Фрагменты шаблонов, отрендеренные заново",
+                    [("", {}, cache.misses)]),
+        *exposition("template_fragment_cache_size", "gauge",
+                    "Фрагменты шаблонов в кеше", [("", {}, len(cache))]),
+    ]
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_page():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,22 +1,21 @@
-from datetime import datetime
-from sqlalchemy import select, desc
 from fastapi import APIRouter, Form, Request, Depends
-from sqlalchemy.orm import selectinload
 from fastapi.responses import RedirectResponse
 from app.auth.dao import UsersDAO
-from app.core.templates import templates
+from app.core.sequences import order_numbers
+from app.core.templates import stream_template, templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.models import User, Clients, Orders
+from app.models.models import User, Clients
 from app.schemas.orders import OrderCreate
 from app.dao.db import connection
-from app.dao.database import async_session_maker
 from app.dao.orders import OrdersDAO
 from app.dao.clients import ClientsDAO
+from app.dao.summary import WorkflowSummaryDAO
+from app.dao.workflow import WorkflowTreeDAO
 from app.auth.utils import authenticate_user, set_tokens
 from app.schemas.auth import EmailModel
 from app.dependencies.auth_dep import check_refresh_token, get_current_user 
-from app.dao.database import get_session
+from app.dao.database import get_session, get_read_session
 
 router = APIRouter()
 
@@ -24,20 +23,35 @@ router = APIRouter()
 @router.get("/orders")
 async def orders_page(
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(get_current_user)
 ):
-    result = await session.execute(
-        select(Orders).options(selectinload(Orders.clients)).order_by(desc(Orders.id))
+    # Списку нужны только номер и название клиента — читаем строки, а не
+    # ORM-объекты с подгрузкой клиентов
+    page = await OrdersDAO(session).paginate(
+        cursor=cursor,
+        limit=limit,
+        descending=True,
+        fields=["id", "number"],
+        joined={"client_name": Clients.name},
+        records=True,
     )
-    orders = result.scalars().all()
 
-    clients = await session.execute(select(Clients).order_by(Clients.name))
-    clients = clients.scalars().all()
-    return templates.TemplateResponse("orders/orders.html", {
+    # Для выпадающего списка достаточно ID и названия клиента
+    # Прогресс заказов — из сводки, без подсчёта процессов и действий
+    summaries = await WorkflowSummaryDAO(session).for_orders(
+        [order.id for order in page.items])
+    clients = await ClientsDAO(session).find_rows(
+        fields=["id", "name"], order_by=[Clients.name])
+    # Список заказов длинный — отдаём страницу по мере рендеринга
+    return stream_template("orders/orders.html", {
         "user": user,
         "request": request,
-        "orders": orders,
+        "orders": page.items,
+        "page": page,
+        "summaries": summaries,
         "clients": clients,
     })
 
@@ -49,12 +63,10 @@ async def create_order(
     session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
 ):
-    now = datetime.now()
-    datetime_str = now.strftime('%Y%m%d%H%M%S')
     order_data = OrderCreate(
         client_id=client_id,
         user_id=user.id,
-        number=int(datetime_str),
+        number=await order_numbers.next(),
         description=description
     )
     await OrdersDAO(session).add(order_data)
@@ -65,10 +77,11 @@ async def create_order(
 async def get_order_by_id(
     order_id: int,
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(get_current_user)
 ):
-    order = await OrdersDAO(session).find_one_or_none_by_id(order_id)
+    # Заказ с клиентом, процессами и действиями — не больше трёх запросов
+    order = await WorkflowTreeDAO(session).load_order(order_id)
     if not order:
         return templates.TemplateResponse("404.html", {
             "request": request,
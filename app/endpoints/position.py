@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.templates import templates
 from app.dao.position import PositionDAO
 from app.dependencies.auth_dep import get_current_user
-from app.dao.database import get_session
-from app.models.models import User
+from app.dependencies.etag_dep import set_etag, table_etag
+from app.dao.versions import bump_table_versions
+from app.dao.database import get_session, get_read_session
+from app.models.models import User, Position
 from app.schemas.position import PositionCreate
 
 router = APIRouter()
@@ -15,15 +17,20 @@ router = APIRouter()
 @router.get("/positions/")
 async def positions_page(
     request: Request,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user)
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+    etag: str = Depends(table_etag(Position))
 ):
-    positions = await PositionDAO(session).find_all()
-    return templates.TemplateResponse("positions/positions.html", {
+    page = await PositionDAO(session).paginate(cursor=cursor, limit=limit)
+    response = templates.TemplateResponse("positions/positions.html", {
         "user": user,
         "request": request,
-        "positions": positions,
+        "positions": page.items,
+        "page": page,
     })
+    return set_etag(response, etag)
 
 
 @router.post("/position/create")
@@ -50,6 +57,7 @@ async def edit_position(
         return RedirectResponse(url="/positions", status_code=404)
 
     position.name = name
+    await bump_table_versions(session, Position)
     await session.commit()
     return RedirectResponse(url="/positions", status_code=303)
 
@@ -81,8 +89,10 @@ async def delete_position(
     position_id: int,
     session: AsyncSession = Depends(get_session),
 ):
-    position = await PositionDAO(session).find_one_or_none_by_id(position_id)
+    position = await PositionDAO(session).find_one_or_none_by_id(
+        position_id, load="detail")
     if position:
         await session.delete(position)
+        await bump_table_versions(session, Position)
         await session.commit()
     return RedirectResponse(url="/positions", status_code=303)
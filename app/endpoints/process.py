@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.utils import QueueService
+from app.dao.database import get_session
+from app.dependencies.auth_dep import get_current_user
+from app.exceptions import InvalidQueueOrderException
+from app.models.models import User, Process
+from app.schemas.queue import QueueOrder
+
+router = APIRouter()
+
+
+@router.post("/order/{order_id}/processes/order")
+async def reorder_order_processes(
+    order_id: int,
+    order: QueueOrder,
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(get_current_user)
+) -> dict:
+    try:
+        await QueueService(session).apply_order(Process, order_id, order.ids)
+    except ValueError:
+        raise InvalidQueueOrderException
+    return {'ok': True, 'ids': order.ids}
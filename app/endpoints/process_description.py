@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Form, Request, Depends
 from fastapi.responses import RedirectResponse
-from sqlalchemy import select, desc
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.templates import templates
 from app.dao.process_description import ProcessDescriptionDAO
 from app.dependencies.auth_dep import get_current_user
-from app.dao.database import get_session
-from app.models.models import User, Position
+from app.dependencies.etag_dep import set_etag, table_etag
+from app.dao.versions import bump_table_versions
+from app.dao.database import get_session, get_read_session
+from app.models.models import User, Position, ProcessDescription
 from app.schemas.process_description import ProcessDescriptionCreate
 
 router = APIRouter()
@@ -16,19 +18,28 @@ router = APIRouter()
 @router.get("/process_description/")
 async def process_description_page(
     request: Request,
-    session: AsyncSession = Depends(get_session),
-    user: User = Depends(get_current_user)
+    cursor: str | None = None,
+    limit: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(get_current_user),
+    etag: str = Depends(table_etag(Position, ProcessDescription))
 ):
-    process_description = await ProcessDescriptionDAO(session).find_all()
+    page = await ProcessDescriptionDAO(session).paginate(
+        cursor=cursor,
+        limit=limit,
+        load="list",
+    )
     position = await session.execute(select(Position).order_by(Position.name))
     position = position.scalars().all()
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "process_description/process_description.html", {
             "user": user,
             "request": request,
-            "process_description": process_description,
+            "process_description": page.items,
+            "page": page,
             "position": position,
         })
+    return set_etag(response, etag)
 
 
 @router.post("/process_description/create")
@@ -63,6 +74,7 @@ async def edit_process_description(
 
     process_description.name = name
     process_description.description = description
+    await bump_table_versions(session, ProcessDescription)
     await session.commit()
     return RedirectResponse(
         url="/process_description/", status_code=303)
@@ -72,7 +84,7 @@ async def edit_process_description(
 async def get_process_description_by_id(
     proc_desc_id: int,
     request: Request,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user: User = Depends(get_current_user)
 ):
     process_description = await (
@@ -98,8 +110,10 @@ async def delete_process_description(
     session: AsyncSession = Depends(get_session),
 ):
     process_description = await (
-        ProcessDescriptionDAO(session).find_one_or_none_by_id(proc_desc_id))
+        ProcessDescriptionDAO(session).find_one_or_none_by_id(
+            proc_desc_id, load="detail"))
     if process_description:
         await session.delete(process_description)
+        await bump_table_versions(session, ProcessDescription)
         await session.commit()
     return RedirectResponse(url="/process_description", status_code=303)
@@ -48,13 +48,14 @@ async def login(
 ):
     users_dao = UsersDAO(session)
     user = await users_dao.find_one_or_none(filters=EmailModel(email=username))
-    if not (user and await authenticate_user(user=user, password=password)):
+    if not (user and await authenticate_user(
+            user=user, password=password, session=session)):
         return templates.TemplateResponse("login.html", {
             "request": request,
             "error": "Неправильный логин или пароль"
         })
     response = redirect_to_login(request, "home_page")
-    set_tokens(response, user.id)
+    set_tokens(response, user)
     return response
 
 
@@ -64,4 +64,35 @@ ForbiddenException = HTTPException(
 TokenInvalidFormatException = HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Неверный формат токена. Ожидается 'Bearer <токен>'"
-)
\ No newline at end of file
+)
+
+# Некорректный курсор пагинации
+InvalidCursorException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail='Некорректный курсор пагинации'
+)
+
+
+# Сервис перегружен
+ServiceBusyException = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail='Сервис перегружен, повторите попытку позже'
+)
+
+# Некорректный порядок элементов очереди
+InvalidQueueOrderException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail='Порядок должен содержать каждый элемент очереди ровно один раз'
+)
+
+# Неизвестные поля в параметре fields
+InvalidFieldsException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail='Неизвестные поля в параметре fields'
+)
+
+# Заказ не найден
+OrderNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail='Заказ не найден'
+)
@@ -1,26 +1,50 @@
 """process monitor"""
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from loguru import logger
 
 from app.auth.router import router as router_auth
+from app.core.logs import setup_logging, shutdown_logging
+from app.core.templates import precompile_templates
+from app.core.metrics import request_duration, requests_in_flight
+from app.dao.database import engines
+from app.dao.query_stats import collect_query_stats, log_repeated_queries
+# Обработчик flush поддерживает сводку workflow_summary при изменении процессов и действий
+from app.dao.summary import track_workflow_summary  # noqa: F401
+from app.auth.utils import (
+    password_executor,
+    set_token_cookies,
+    setup_password_hashing)
 from app.endpoints.start import router as router_start
 from app.endpoints.clients import router as router_clients
 from app.endpoints.orders import router as router_orders
 from app.endpoints.position import router as router_position
 from app.endpoints.process_description import router as router_process_description
 from app.endpoints.action_description import router as router_action_description
+from app.endpoints.export import router as router_export
+from app.endpoints.process import router as router_process
+from app.endpoints.action import router as router_action
+from app.endpoints.metrics import router as router_metrics
+from app.endpoints.api import router as router_api
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Управление жизненным циклом приложения."""
+    setup_logging()
     logger.info("Инициализация приложения...")
+    engines.start()
+    precompile_templates()
+    await setup_password_hashing()
     yield
     logger.info("Завершение работы приложения...")
+    password_executor.shutdown()
+    await engines.dispose()
+    await shutdown_logging()
 
 
 def create_app() -> FastAPI:
@@ -53,6 +77,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"]
     )
 
+    # Обновлённые при аутентификации токены возвращаются в куках
+    app.middleware("http")(refresh_tokens_middleware)
+
+    # Число SQL-запросов и время в БД для каждого запроса
+    app.middleware("http")(query_stats_middleware)
+
+    # Время обработки и число одновременных запросов для /metrics
+    app.middleware("http")(metrics_middleware)
+
     # Монтирование статических файлов
     app.mount(
         '/static',
@@ -66,6 +99,61 @@ def create_app() -> FastAPI:
     return app
 
 
+async def refresh_tokens_middleware(request: Request, call_next) -> Response:
+    """Выставляет куки с токенами, перевыпущенными в get_current_user."""
+    response = await call_next(request)
+    tokens = getattr(request.state, "refreshed_tokens", None)
+    if tokens:
+        set_token_cookies(response, tokens)
+    return response
+
+
+async def query_stats_middleware(request: Request, call_next) -> Response:
+    """Добавляет заголовок Server-Timing и предупреждает о повторах запросов."""
+    with collect_query_stats() as stats:
+        response = await call_next(request)
+    response.headers.append("Server-Timing", stats.server_timing())
+    log_repeated_queries(stats, request.url.path)
+    return response
+
+
+# Шаблон пути маршрута по его обработчику, чтобы метки не зависели от ID
+_route_paths: dict = {}
+
+
+def route_label(request: Request) -> str:
+    endpoint = request.scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    if endpoint not in _route_paths:
+        _route_paths[endpoint] = next(
+            (route.path for route in request.app.routes
+             if getattr(route, "endpoint", None) is endpoint),
+            "unmatched",
+        )
+    return _route_paths[endpoint]
+
+
+async def metrics_middleware(request: Request, call_next) -> Response:
+    """Считает время обработки запроса по маршрутам и запросы в работе."""
+    method = request.method
+    status = 500
+    requests_in_flight.inc(method=method)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        requests_in_flight.dec(method=method)
+        request_duration.observe(
+            time.perf_counter() - start,
+            method=method,
+            route=route_label(request),
+            status=str(status),
+        )
+
+
 def register_routers(app: FastAPI) -> None:
     """Регистрация роутеров приложения."""
 
@@ -82,6 +170,16 @@ def register_routers(app: FastAPI) -> None:
         router_process_description, tags=["process_description"])
     app.include_router(
         router_clients, tags=["clients"])
+    app.include_router(
+        router_export, tags=["export"])
+    app.include_router(
+        router_process, tags=["process"])
+    app.include_router(
+        router_action, tags=["action"])
+    app.include_router(
+        router_metrics, tags=["metrics"])
+    app.include_router(
+        router_api, tags=["api"])
     # app.include_router(root_router, tags=["root"])
     app.include_router(
         router_auth, prefix='/auth', tags=['Auth'])
@@ -0,0 +1,49 @@
+"""table versions table
+
+Revision ID: 41d2b00c9c51
+Revises: cdbed2a3a4fe
+Create Date: 2026-10-18 18:25:06.771521
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '41d2b00c9c51'
+down_revision: Union[str, None] = 'cdbed2a3a4fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Таблицы, по версиям которых страницы справочников вычисляют ETag
+TABLES = ('position', 'clients', 'process_description', 'action_description')
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    # Текущие версии переносятся из таблицы счётчиков, чтобы сохранённые
+    # браузерами ETag не совпали с новыми версиями случайно
+    op.execute(
+        "INSERT INTO table_versions (name, version) "
+        "SELECT substr(name, 7), next_value FROM counters "
+        "WHERE name IN (" + ", ".join(f"'table:{t}'" for t in TABLES) + ")"
+    )
+    op.execute("DELETE FROM counters WHERE name LIKE 'table:%'")
+
+
+def downgrade() -> None:
+    op.execute(
+        "INSERT INTO counters (name, next_value) "
+        "SELECT 'table:' || name, version FROM table_versions"
+    )
+    op.drop_table('table_versions')
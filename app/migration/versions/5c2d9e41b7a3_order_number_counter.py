@@ -0,0 +1,39 @@
+"""order number counter
+
+Revision ID: 5c2d9e41b7a3
+Revises: ea31563d90f9
+Create Date: 2026-10-18 10:12:05.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2d9e41b7a3'
+down_revision: Union[str, None] = 'ea31563d90f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('counters',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('next_value', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    # Продолжаем нумерацию после уже выданных номеров заказов
+    op.execute(
+        "INSERT INTO counters (name, next_value) "
+        "SELECT 'orders.number', COALESCE(MAX(number), 0) + 1 FROM orders"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('counters')
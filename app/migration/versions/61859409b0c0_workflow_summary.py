@@ -0,0 +1,63 @@
+"""workflow summary
+
+Revision ID: 61859409b0c0
+Revises: d7e3a58c1f40
+Create Date: 2026-10-18 18:05:11.776943
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '61859409b0c0'
+down_revision: Union[str, None] = 'd7e3a58c1f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('workflow_summary',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('process_id', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('item', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('last_activity_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('order_id', 'process_id', 'item', 'status', name='uq_workflow_summary_key')
+    )
+    op.create_index('ix_workflow_summary_process_id', 'workflow_summary', ['process_id'], unique=False)
+    # Сводка по уже существующим процессам и действиям
+    op.execute(
+        "INSERT INTO workflow_summary "
+        "(order_id, process_id, item, status, total, last_activity_at) "
+        "SELECT order_id, 0, 'process', status, COUNT(*), MAX(updated_at) "
+        "FROM process GROUP BY order_id, status"
+    )
+    op.execute(
+        "INSERT INTO workflow_summary "
+        "(order_id, process_id, item, status, total, last_activity_at) "
+        "SELECT process.order_id, 0, 'action', action.status, COUNT(*), "
+        "MAX(action.updated_at) "
+        "FROM action JOIN process ON action.process_id = process.id "
+        "GROUP BY process.order_id, action.status"
+    )
+    op.execute(
+        "INSERT INTO workflow_summary "
+        "(order_id, process_id, item, status, total, last_activity_at) "
+        "SELECT process.order_id, action.process_id, 'action', action.status, "
+        "COUNT(*), MAX(action.updated_at) "
+        "FROM action JOIN process ON action.process_id = process.id "
+        "GROUP BY process.order_id, action.process_id, action.status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workflow_summary_process_id', table_name='workflow_summary')
+    op.drop_table('workflow_summary')
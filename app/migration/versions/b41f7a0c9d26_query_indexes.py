@@ -0,0 +1,34 @@
+"""query indexes
+
+Revision ID: b41f7a0c9d26
+Revises: 5c2d9e41b7a3
+Create Date: 2026-10-18 11:40:52.604317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f7a0c9d26'
+down_revision: Union[str, None] = '5c2d9e41b7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_orders_client_id'), 'orders', ['client_id'], unique=False)
+    op.create_index(op.f('ix_orders_user_id'), 'orders', ['user_id'], unique=False)
+    op.create_index('ix_action_process_id_status', 'action', ['process_id', 'status'], unique=False)
+    op.create_index(op.f('ix_process_status'), 'process', ['status'], unique=False)
+    op.create_index(op.f('ix_process_description_position_id'), 'process_description', ['position_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_process_description_position_id'), table_name='process_description')
+    op.drop_index(op.f('ix_process_status'), table_name='process')
+    op.drop_index('ix_action_process_id_status', table_name='action')
+    op.drop_index(op.f('ix_orders_user_id'), table_name='orders')
+    op.drop_index(op.f('ix_orders_client_id'), table_name='orders')
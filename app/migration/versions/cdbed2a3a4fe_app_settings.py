@@ -0,0 +1,37 @@
+"""app settings
+
+Revision ID: cdbed2a3a4fe
+Revises: 61859409b0c0
+Create Date: 2026-10-18 18:24:21.949685
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cdbed2a3a4fe'
+down_revision: Union[str, None] = '61859409b0c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('app_settings',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    # Откалиброванная стоимость bcrypt раньше хранилась в таблице счётчиков;
+    # без неё воркеры один раз откалибруют стоимость заново
+    op.execute("DELETE FROM counters WHERE name = 'bcrypt.rounds'")
+
+
+def downgrade() -> None:
+    op.drop_table('app_settings')
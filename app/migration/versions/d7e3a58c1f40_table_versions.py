@@ -0,0 +1,36 @@
+"""table versions
+
+Revision ID: d7e3a58c1f40
+Revises: b41f7a0c9d26
+Create Date: 2026-10-18 13:05:37.281940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e3a58c1f40'
+down_revision: Union[str, None] = 'b41f7a0c9d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    'roles', 'position', 'users', 'clients', 'orders',
+    'process_description', 'action_description', 'process', 'action',
+)
+
+
+def upgrade() -> None:
+    # Строки версий создаются заранее, чтобы первые записи в таблицы
+    # не вставляли их одновременно
+    op.bulk_insert(
+        sa.table('counters', sa.column('name'), sa.column('next_value')),
+        [{'name': f'table:{table}', 'next_value': 1} for table in TABLES],
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM counters WHERE name LIKE 'table:%'")
@@ -1,12 +1,17 @@
-from sqlalchemy import text, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import func, text, ForeignKey, Index, Text, TIMESTAMP, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.dao.database import Base, str_uniq
+from app.dao.loaders import DEFAULT_LAZY
+from datetime import datetime
 from typing import Literal
 
 
 class Role(Base):
     name: Mapped[str_uniq]
-    users: Mapped[list["User"]] = relationship(back_populates="role")
+    users: Mapped[list["User"]] = relationship(
+        back_populates="role",
+        lazy=DEFAULT_LAZY
+    )
 
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id}, name={self.name})"
@@ -16,10 +21,14 @@ class Position(Base):
     __tablename__ = "position"
 
     name: Mapped[str_uniq]
-    users: Mapped[list["User"]] = relationship(back_populates="position")
+    users: Mapped[list["User"]] = relationship(
+        back_populates="position",
+        lazy=DEFAULT_LAZY
+    )
     process_description = relationship(
         "ProcessDescription",
-        back_populates="position"
+        back_populates="position",
+        lazy=DEFAULT_LAZY
     )
 
     def __repr__(self):
@@ -45,18 +54,42 @@ class User(Base):
     position: Mapped["Position"] = relationship(
         "Position",
         back_populates="users",
-        lazy="joined"
+        lazy=DEFAULT_LAZY
     )
     role: Mapped["Role"] = relationship(
         "Role",
         back_populates="users",
-        lazy="joined"
+        lazy=DEFAULT_LAZY
     )
 
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id})"
 
 
+class Counter(Base):
+    """Счётчик последовательности: следующее ещё не выданное значение."""
+    __tablename__: Literal["counters"] = "counters"
+
+    name: Mapped[str_uniq]
+    next_value: Mapped[int] = mapped_column(nullable=False)
+
+
+class TableVersion(Base):
+    """Версия содержимого таблицы для ETag страниц, которые её показывают."""
+    __tablename__: Literal["table_versions"] = "table_versions"
+
+    name: Mapped[str_uniq]
+    version: Mapped[int] = mapped_column(nullable=False)
+
+
+class AppSetting(Base):
+    """Значение, которое вычисляется при работе и общее для всех воркеров."""
+    __tablename__: Literal["app_settings"] = "app_settings"
+
+    name: Mapped[str_uniq]
+    value: Mapped[str] = mapped_column(nullable=False)
+
+
 class Clients(Base):
     __tablename__: Literal["clients"] = "clients"
 
@@ -65,7 +98,8 @@ class Clients(Base):
 
     orders = relationship(
         "Orders",
-        back_populates="clients"
+        back_populates="clients",
+        lazy=DEFAULT_LAZY
     )
 
 
@@ -74,9 +108,16 @@ class Orders(Base):
 
     number: Mapped[int] = mapped_column(unique=True, nullable=False)
     description: Mapped[str] = mapped_column(Text)
-    client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"))
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    clients = relationship("Clients", back_populates="orders")
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("clients.id"),
+        index=True
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    clients = relationship(
+        "Clients",
+        back_populates="orders",
+        lazy=DEFAULT_LAZY
+    )
 
 
 class Action(Base):
@@ -104,16 +145,18 @@ class Action(Base):
             'queue',
             name='uq_action_process_queue'
         ),
+        Index('ix_action_process_id_status', 'process_id', 'status'),
     )
 
     action_description = relationship(
         "ActionDescription",
         back_populates="actions",
-        lazy="joined"
+        lazy=DEFAULT_LAZY
     )
     process = relationship(
         "Process",
-        back_populates="actions"
+        back_populates="actions",
+        lazy=DEFAULT_LAZY
     )
 
 
@@ -127,7 +170,8 @@ class ActionDescription(Base):
     actions = relationship(
         "Action",
         back_populates="action_description",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY
     )
 
 
@@ -140,7 +184,7 @@ class Process(Base):
     order_id: Mapped[int] = mapped_column(index=True)
     coordinator_user_id: Mapped[int] = mapped_column(index=True)
     queue: Mapped[int]
-    status: Mapped[str] = mapped_column(default="pending")
+    status: Mapped[str] = mapped_column(default="pending", index=True)
 
     __table_args__ = (
         UniqueConstraint(
@@ -153,12 +197,13 @@ class Process(Base):
     process_description = relationship(
         "ProcessDescription",
         back_populates="processes",
-        lazy="joined"
+        lazy=DEFAULT_LAZY
     )
     actions = relationship(
         "Action",
         back_populates="process",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY
     )
 
 
@@ -168,10 +213,56 @@ class ProcessDescription(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(unique=True)
     description: Mapped[str] = mapped_column(Text)
-    position_id: Mapped[int] = mapped_column(ForeignKey("position.id"))
-    position = relationship("Position", back_populates="process_description")
+    position_id: Mapped[int] = mapped_column(
+        ForeignKey("position.id"),
+        index=True
+    )
+    position = relationship(
+        "Position",
+        back_populates="process_description",
+        lazy=DEFAULT_LAZY
+    )
     processes = relationship(
         "Process",
         back_populates="process_description",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy=DEFAULT_LAZY
+    )
+
+
+class WorkflowSummary(Base):
+    """
+    Число процессов или действий (item) со статусом status и время
+    последнего изменения. Строки с process_id=0 относятся ко всему заказу,
+    остальные — к действиям одного процесса.
+    """
+    __tablename__: Literal["workflow_summary"] = "workflow_summary"
+
+    order_id: Mapped[int] = mapped_column(nullable=False)
+    process_id: Mapped[int] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default=text("0")
+    )
+    item: Mapped[str] = mapped_column(nullable=False)
+    status: Mapped[str] = mapped_column(nullable=False)
+    total: Mapped[int] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default=text("0")
+    )
+    last_activity_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP,
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            'order_id',
+            'process_id',
+            'item',
+            'status',
+            name='uq_workflow_summary_key'
+        ),
+        Index('ix_workflow_summary_process_id', 'process_id'),
     )
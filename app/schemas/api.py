@@ -0,0 +1,22 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class OrdersFilter(BaseModel):
+    client_id: Optional[int] = None
+    user_id: Optional[int] = None
+
+
+class ProcessFilter(BaseModel):
+    order_id: Optional[int] = None
+    status: Optional[str] = None
+
+
+class ActionFilter(BaseModel):
+    process_id: Optional[int] = None
+    status: Optional[str] = None
+
+
+class ProcessDescriptionFilter(BaseModel):
+    position_id: Optional[int] = None
@@ -8,7 +8,6 @@ from pydantic import (
     field_validator,
     model_validator,
     computed_field)
-from app.auth.utils import get_password_hash
 
 
 class EmailModel(BaseModel):
@@ -59,7 +58,6 @@ class SUserRegister(UserBase):
     def check_password(self) -> Self:
         if self.password != self.confirm_password:
             raise ValueError("Пароли не совпадают")
-        self.password = get_password_hash(self.password)
         return self
 
 
@@ -95,3 +93,12 @@ class SUserInfo(UserBase):
     @computed_field
     def role_id(self) -> int:
         return self.role.id
+
+
+class SUserClaims(BaseModel):
+    """Пользователь, восстановленный из claims access-токена."""
+    id: int = Field(validation_alias="sub")
+    role_id: int
+    position_id: int
+    first_name: str
+    last_name: str
@@ -0,0 +1,13 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, ConfigDict
+
+ItemT = TypeVar("ItemT")
+
+
+class Page(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    limit: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -0,0 +1,8 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class QueueOrder(BaseModel):
+    ids: List[int] = Field(
+        description="ID всех элементов очереди в новом порядке"
+    )
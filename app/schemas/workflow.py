@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+from app.config import settings
+
+
+class WorkflowNode(BaseModel):
+    # Узлы дерева неизменяемы: дерево можно безопасно кешировать и отдавать
+    model_config = ConfigDict(frozen=True)
+
+
+class ActionNode(WorkflowNode):
+    id: int
+    queue: int
+    status: str
+    implementer_user_id: int
+    actions_description_id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+
+
+class ProcessNode(WorkflowNode):
+    id: int
+    queue: int
+    status: str
+    coordinator_user_id: int
+    process_description_id: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    actions: Tuple[ActionNode, ...] = ()
+
+
+class ClientNode(WorkflowNode):
+    id: int
+    name: str
+
+
+class OrderTree(WorkflowNode):
+    id: int
+    number: int
+    description: Optional[str] = None
+    user_id: int
+    created_at: datetime
+    client: Optional[ClientNode] = None
+    processes: Tuple[ProcessNode, ...] = ()
+
+
+class WorkflowSummaryNode(WorkflowNode):
+    """Число процессов и действий по статусам и время последнего изменения."""
+    processes: Dict[str, int] = {}
+    actions: Dict[str, int] = {}
+    last_activity_at: Optional[datetime] = None
+
+    @property
+    def processes_total(self) -> int:
+        return sum(self.processes.values())
+
+    @property
+    def processes_done(self) -> int:
+        return self.processes.get(settings.WORKFLOW_DONE_STATUS, 0)
+
+    @property
+    def actions_total(self) -> int:
+        return sum(self.actions.values())
+
+    @property
+    def actions_done(self) -> int:
+        return self.actions.get(settings.WORKFLOW_DONE_STATUS, 0)
@@ -0,0 +1,32 @@
+"""
+Сравнение ORM-вставки и массовой вставки BaseDAO.add_many.
+
+Запуск: python -m benchmarks.bench_add_many [количество строк]
+"""
+import asyncio
+import sys
+
+from benchmarks.common import session_maker, temp_database, timer
+from app.dao.clients import ClientsDAO
+from app.schemas.clients import ClientsCreate
+
+
+async def run(rows: int) -> None:
+    clients = [
+        ClientsCreate(name=f"Клиент {i}", description="Описание клиента")
+        for i in range(rows)
+    ]
+    for label, kwargs in (
+        ("ORM: add_all + flush", {}),
+        ("bulk: insert() executemany", {"bulk": True}),
+        ("bulk: insert() + RETURNING id", {"bulk": True, "returning": True}),
+    ):
+        async with temp_database() as engine:
+            async with session_maker(engine)() as session:
+                with timer(label, rows):
+                    await ClientsDAO(session).add_many(clients, **kwargs)
+                    await session.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
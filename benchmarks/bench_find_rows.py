@@ -0,0 +1,65 @@
+"""
+Сравнение чтения списка заказов с названием клиента: ORM-объекты Orders с
+selectinload(Orders.clients) и записи BaseDAO.find_rows с присоединённой
+колонкой. Печатает время и пик выделенной памяти (tracemalloc).
+
+Запуск: python -m benchmarks.bench_find_rows [количество заказов]
+"""
+import asyncio
+import sys
+import tracemalloc
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import session_maker, temp_database, timer
+from app.dao.orders import OrdersDAO
+from app.models.models import Clients, Orders
+
+CLIENTS = 1_000
+
+
+async def seed(engine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(insert(Clients), [
+            {"name": f"Клиент {i}", "description": "Описание клиента"}
+            for i in range(CLIENTS)
+        ])
+        await conn.execute(insert(Orders), [
+            {"number": i, "description": "Описание заказа",
+             "client_id": i % CLIENTS + 1, "user_id": 1}
+            for i in range(rows)
+        ])
+
+
+async def orm_list(session) -> list[tuple]:
+    result = await session.scalars(
+        select(Orders).options(selectinload(Orders.clients)).order_by(Orders.id))
+    return [(order.id, order.number, order.clients.name) for order in result]
+
+
+async def rows_list(session) -> list[tuple]:
+    return await OrdersDAO(session).find_rows(
+        fields=["id", "number"], joined={"client_name": Clients.name})
+
+
+async def run(rows: int) -> None:
+    async with temp_database() as engine:
+        await seed(engine, rows)
+        results = []
+        for label, load in (
+            ("ORM: Orders + selectinload(clients)", orm_list),
+            ("find_rows: id, number, client_name", rows_list),
+        ):
+            async with session_maker(engine)() as session:
+                tracemalloc.start()
+                with timer(label, rows):
+                    results.append(await load(session))
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{'':<40} пик памяти {peak / 2**20:8.1f} МБ")
+        assert [tuple(row) for row in results[1]] == results[0]
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
@@ -0,0 +1,61 @@
+"""
+Задержка event loop при одновременных входах пользователей.
+
+Сравнивает синхронную проверку bcrypt в корутине с проверкой в
+ограниченном пуле потоков (verify_password_async). Пока идут входы,
+фоновая задача каждые 10 мс замеряет, насколько позже она просыпается.
+
+Запуск: python -m benchmarks.bench_login_latency [число входов]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from benchmarks.common import timer
+from app.auth.utils import (
+    get_password_hash,
+    password_executor,
+    verify_password,
+    verify_password_async,
+)
+
+TICK = 0.01
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def sync_login(password: str, hashed: str) -> bool:
+    return verify_password(password, hashed)
+
+
+async def run_case(label: str, login, logins: int, hashed: str) -> None:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    await asyncio.sleep(TICK * 3)
+    with timer(label, logins, unit="входов"):
+        await asyncio.gather(*(login("password", hashed) for _ in range(logins)))
+    stop.set()
+    await ticker
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[int(len(lags_ms) * 0.99) - 1] if len(lags_ms) > 1 else lags_ms[-1]
+    print(f"{'':<40} задержка loop: медиана {statistics.median(lags_ms):.1f} мс, "
+          f"p99 {p99:.1f} мс, максимум {lags_ms[-1]:.1f} мс")
+
+
+async def run(logins: int) -> None:
+    hashed = get_password_hash("password")
+    await run_case("bcrypt в event loop", sync_login, logins, hashed)
+    await run_case("bcrypt в пуле потоков", verify_password_async, logins, hashed)
+    print(f"Метрики пула: {password_executor.stats()}")
+    password_executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -0,0 +1,73 @@
+"""
+Сравнение сериализации моделей в словари: прежний Base.to_dict через
+inspect() и isinstance, скомпилированный сериализатор модели и
+Base.to_dicts на строках Core.
+
+Запуск: python -m benchmarks.bench_serializers [количество строк]
+"""
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import inspect, select
+
+from benchmarks.common import session_maker, temp_database, timer
+from app.dao.clients import ClientsDAO
+from app.models.models import Clients
+from app.schemas.clients import ClientsCreate
+
+
+def legacy_to_dict(obj, exclude_none: bool = False) -> dict:
+    """Base.to_dict до компиляции сериализаторов."""
+    result = {}
+    for column in inspect(obj.__class__).columns:
+        value = getattr(obj, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        if not exclude_none or value is not None:
+            result[column.key] = value
+    return result
+
+
+async def run(rows: int) -> None:
+    async with temp_database() as engine:
+        async with session_maker(engine)() as session:
+            await ClientsDAO(session).add_many([
+                ClientsCreate(name=f"Клиент {i}", description="Описание клиента")
+                for i in range(rows)
+            ], bulk=True)
+            await session.commit()
+
+        async with session_maker(engine)() as session:
+            objects = (await session.scalars(select(Clients))).all()
+            core_rows = (await session.execute(select(Clients.__table__))).all()
+
+            with timer("inspect + isinstance (прежний)", rows):
+                legacy = [legacy_to_dict(obj) for obj in objects]
+            with timer("скомпилированный to_dict", rows):
+                compiled = [obj.to_dict() for obj in objects]
+            with timer("to_dicts: ORM-объекты", rows):
+                Clients.to_dicts(objects)
+            with timer("to_dicts: строки Core", rows):
+                from_rows = Clients.to_dicts(core_rows)
+            assert legacy == compiled == from_rows
+
+        # Полный путь: выборка и сериализация
+        async with session_maker(engine)() as session:
+            with timer("ORM-выборка + прежний to_dict", rows):
+                objects = (await session.scalars(select(Clients))).all()
+                [legacy_to_dict(obj) for obj in objects]
+        async with session_maker(engine)() as session:
+            with timer("Core-выборка + to_dicts", rows):
+                Clients.to_dicts(
+                    (await session.execute(select(Clients.__table__))).all())
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,75 @@
+"""
+Пропускная способность SQLite с настройками по умолчанию и с профилем
+производительности из Settings (WAL, synchronous=NORMAL, mmap, cache).
+
+Нагрузка: писатели вставляют заказы по одному с коммитом на каждый,
+читатели параллельно читают страницы заказов.
+
+Запуск: python -m benchmarks.bench_sqlite_pragmas [записей на писателя]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select
+
+from benchmarks.common import session_maker, temp_database
+from app.config import settings
+from app.models.models import Clients, Orders, Position, Role, User
+
+WRITERS = 4
+READERS = 4
+
+
+async def seed(maker) -> None:
+    async with maker() as session:
+        session.add_all([Role(name="user"), Position(name="position")])
+        await session.flush()
+        session.add(User(
+            phone_number="+70000000000", first_name="Bench", last_name="User",
+            email="bench@example.com", password="x"))
+        session.add(Clients(name="Клиент", description="Описание"))
+        await session.commit()
+
+
+async def writer(maker, worker: int, writes: int) -> None:
+    for i in range(writes):
+        async with maker() as session:
+            session.add(Orders(
+                number=worker * 1_000_000 + i, description="Заказ",
+                client_id=1, user_id=1))
+            await session.commit()
+
+
+async def reader(maker, stop: asyncio.Event, counter: list[int]) -> None:
+    while not stop.is_set():
+        async with maker() as session:
+            await session.execute(
+                select(Orders).order_by(Orders.id.desc()).limit(50))
+        counter[0] += 1
+
+
+async def run_case(label: str, pragmas: dict | None, writes: int) -> None:
+    async with temp_database(pragmas=pragmas) as engine:
+        maker = session_maker(engine)
+        await seed(maker)
+        stop = asyncio.Event()
+        reads = [0]
+        readers = [asyncio.create_task(reader(maker, stop, reads)) for _ in range(READERS)]
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(maker, w, writes) for w in range(WRITERS)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*readers)
+    total = WRITERS * writes
+    print(f"{label:<30} {elapsed:8.3f} с, записей {total / elapsed:,.0f}/с, "
+          f"чтений {reads[0] / elapsed:,.0f}/с")
+
+
+async def run(writes: int) -> None:
+    await run_case("SQLite по умолчанию", {"busy_timeout": 5000}, writes)
+    await run_case("профиль из Settings", settings.sqlite_pragmas, writes)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 250))
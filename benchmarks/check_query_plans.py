@@ -0,0 +1,204 @@
+"""
+Проверка планов запросов DAO и QueueService.
+
+Заполняет временную базу, выполняет типичные операции DAO и очередей,
+перехватывает каждый SQL-запрос и прогоняет его через EXPLAIN QUERY PLAN.
+Полный просмотр таблицы в запросе с условием WHERE считается ошибкой:
+такому фильтру нужен индекс. Просмотр без условия (списки, выгрузка)
+выводится для сведения.
+
+Запуск: python -m benchmarks.check_query_plans [строк в таблице]
+Код возврата 1, если найден хотя бы один полный просмотр с фильтром.
+"""
+import asyncio
+import re
+import sys
+
+from pydantic import BaseModel, create_model
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import session_maker, temp_database
+from app.auth.dao import RoleDAO, UsersDAO
+from app.core.utils import QueueService
+from app.dao.action import ActionDAO
+from app.dao.action_description import ActionDescriptionDAO
+from app.dao.clients import ClientsDAO
+from app.dao.orders import OrdersDAO
+from app.dao.position import PositionDAO
+from app.dao.process import ProcessDAO
+from app.dao.process_description import ProcessDescriptionDAO
+from app.dao.summary import WorkflowSummaryDAO
+from app.dao.workflow import WorkflowTreeDAO
+from app.models.models import (
+    Action,
+    ActionDescription,
+    Clients,
+    Orders,
+    Position,
+    Process,
+    ProcessDescription,
+    Role,
+    User,
+)
+
+DAOS = (
+    RoleDAO, UsersDAO, PositionDAO, ClientsDAO, OrdersDAO,
+    ProcessDescriptionDAO, ActionDescriptionDAO, ProcessDAO, ActionDAO,
+)
+CHECKED_STATEMENTS = ("SELECT", "UPDATE", "DELETE")
+# «SCAN orders» — полный просмотр; «SCAN orders USING INDEX ...» — обход индекса
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+
+def filters(**values) -> BaseModel:
+    """Фильтр для методов BaseDAO из произвольных полей."""
+    model = create_model(
+        "Filters", **{name: (type(value), ...) for name, value in values.items()}
+    )
+    return model(**values)
+
+
+async def seed(session: AsyncSession, rows: int) -> None:
+    processes = rows * 4
+    for model, values in (
+        (Role, [{"name": f"role {i}"} for i in range(1, 5)]),
+        (Position, [{"name": f"position {i}"} for i in range(1, 21)]),
+        (User, [
+            {"phone_number": f"+7{i:010d}", "first_name": "Имя",
+             "last_name": "Фамилия", "email": f"user{i}@example.com",
+             "password": "-", "position_id": i % 20 + 1, "role_id": i % 4 + 1}
+            for i in range(rows)
+        ]),
+        (Clients, [
+            {"name": f"Клиент {i}", "description": "-"} for i in range(rows)
+        ]),
+        (Orders, [
+            {"number": i + 1, "description": "-", "client_id": i % rows + 1,
+             "user_id": i % rows + 1}
+            for i in range(rows)
+        ]),
+        (ProcessDescription, [
+            {"name": f"process {i}", "description": "-",
+             "position_id": i % 20 + 1}
+            for i in range(50)
+        ]),
+        (ActionDescription, [
+            {"name": f"action {i}", "description": "-"} for i in range(50)
+        ]),
+        (Process, [
+            {"process_description_id": i % 50 + 1, "order_id": i // 4 + 1,
+             "coordinator_user_id": i % rows + 1,
+             "queue": (i % 4 + 1) * 1024,
+             "status": "done" if i % 3 else "pending"}
+            for i in range(processes)
+        ]),
+        (Action, [
+            {"process_id": i // 4 + 1, "actions_description_id": i % 50 + 1,
+             "implementer_user_id": i % rows + 1,
+             "queue": (i % 4 + 1) * 1024,
+             "status": "done" if i % 3 else "pending"}
+            for i in range(processes * 4)
+        ]),
+    ):
+        await session.execute(insert(model), values)
+    await session.commit()
+
+
+async def workload(session: AsyncSession) -> None:
+    """Операции, запросы которых проверяются."""
+    for dao_cls in DAOS:
+        dao = dao_cls(session)
+        await dao.find_one_or_none_by_id(1)
+        await dao.count()
+        page = await dao.paginate(limit=10, descending=True)
+        await dao.paginate(cursor=page.next_cursor, limit=10,
+                           descending=True)
+        async for _ in dao.stream(batch_size=100):
+            pass
+    await OrdersDAO(session).find_all()
+
+    await UsersDAO(session).find_one_or_none(filters(email="user1@example.com"))
+    await UsersDAO(session).find_one_or_none(filters(phone_number="+70000000001"))
+    await OrdersDAO(session).paginate(filters(client_id=1), limit=10)
+    await OrdersDAO(session).count(filters(user_id=1))
+    await ProcessDAO(session).find_all(filters(order_id=1))
+    await ProcessDAO(session).paginate(filters(status="pending"), limit=10)
+    await ActionDAO(session).find_all(filters(process_id=1, status="pending"))
+    await ProcessDescriptionDAO(session).find_all(filters(position_id=1))
+    await ActionDescriptionDAO(session).find_one_or_none(filters(name="action 1"))
+    await WorkflowTreeDAO(session).load_order(1)
+    await WorkflowSummaryDAO(session).for_orders([1, 2, 3])
+    await WorkflowSummaryDAO(session).for_processes([1, 2, 3])
+    await WorkflowSummaryDAO(session).rebuild([1])
+
+    queue = QueueService(session)
+    await queue.get_order_processes(1)
+    await queue.get_process_actions(1)
+    await queue.move_process_in_order_queue(1, 3)
+    await queue.move_action_in_process_queue(1, 3)
+    await queue.set_process_status(1, "done")
+    await queue.set_action_status(1, "done")
+    await queue.rebalance(Process, "order_id", 1)
+    await queue.rebalance(Action, "process_id", 1)
+    await session.commit()
+    await queue.apply_order(Process, 1, [4, 3, 2, 1])
+    await queue.apply_order(Action, 1, [4, 3, 2, 1])
+    # Процесс и действие без описания не проходят NOT NULL,
+    # но запрос max(queue) к этому моменту уже выполнен
+    for add in (queue.add_process_to_order, queue.add_action_to_process):
+        try:
+            await add(1)
+        except IntegrityError:
+            await session.rollback()
+
+
+async def run(rows: int) -> int:
+    async with temp_database() as engine:
+        async with session_maker(engine)() as session:
+            await seed(session, rows)
+
+        statements: dict[str, tuple] = {}
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(CHECKED_STATEMENTS):
+                if executemany:
+                    parameters = parameters[0]
+                statements.setdefault(statement, parameters)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        async with session_maker(engine)() as session:
+            await workload(session)
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        problems = 0
+        unfiltered: set[str] = set()
+        async with engine.connect() as conn:
+            for statement, parameters in statements.items():
+                plan = await conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters)
+                scans = [
+                    match.group(1) for *_, detail in plan
+                    if (match := FULL_SCAN.match(detail))
+                ]
+                if not scans:
+                    continue
+                if not WHERE.search(statement):
+                    unfiltered.update(scans)
+                    continue
+                problems += 1
+                print(f"Полный просмотр {', '.join(scans)}:")
+                print("    " + " ".join(statement.split()))
+
+        print(f"Проверено запросов: {len(statements)}, "
+              f"полных просмотров с фильтром: {problems}")
+        if unfiltered:
+            print("Просмотр без фильтра (списки и выгрузка): "
+                  + ", ".join(sorted(unfiltered)))
+        return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)))
@@ -0,0 +1,93 @@
+"""
+Проверка сводки по заказам (workflow_summary).
+
+Заполняет временную базу, строит сводку WorkflowSummaryDAO.rebuild(), затем
+добавляет, удаляет, меняет статус и переносит в другой заказ процессы и
+действия через ORM и QueueService. После каждого шага сводка, обновлённая
+обработчиком flush, сравнивается с пересчётом с нуля.
+
+Запуск: python -m benchmarks.check_workflow_summary [строк в таблице]
+Код возврата 1, если сводка хотя бы раз разошлась с пересчётом.
+"""
+import asyncio
+import sys
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.check_query_plans import seed
+from benchmarks.common import session_maker, temp_database
+from app.core.utils import QueueService
+from app.dao.summary import WorkflowSummaryDAO
+from app.models.models import Action, Process, WorkflowSummary
+
+COLUMNS = (
+    WorkflowSummary.order_id, WorkflowSummary.process_id,
+    WorkflowSummary.item, WorkflowSummary.status, WorkflowSummary.total,
+)
+
+
+async def snapshot(session: AsyncSession) -> set[tuple]:
+    return set((await session.execute(select(*COLUMNS))).tuples().all())
+
+
+async def compare(engine, label: str) -> bool:
+    """Сравнивает сводку с пересчётом в транзакции, которая откатывается."""
+    async with session_maker(engine)() as session:
+        tracked = await snapshot(session)
+        await WorkflowSummaryDAO(session).rebuild()
+        expected = await snapshot(session)
+        await session.rollback()
+    ok = tracked == expected
+    print(f"{label:<40} {'OK' if ok else 'РАСХОЖДЕНИЕ'}")
+    for row in sorted(tracked - expected):
+        print(f"    лишняя строка: {row}")
+    for row in sorted(expected - tracked):
+        print(f"    нет строки:    {row}")
+    return ok
+
+
+async def run(rows: int) -> int:
+    async with temp_database() as engine:
+        async with session_maker(engine)() as session:
+            await seed(session, rows)
+            await WorkflowSummaryDAO(session).rebuild()
+            await session.commit()
+
+        async def add(session: AsyncSession):
+            session.add(Process(
+                order_id=2, process_description_id=1, coordinator_user_id=1,
+                queue=99 * 1024))
+            session.add(Action(
+                process_id=5, actions_description_id=1, implementer_user_id=1,
+                queue=99 * 1024))
+            await session.commit()
+
+        async def move(session: AsyncSession):
+            process = await session.get(Process, 5)
+            process.order_id = 3
+            process.queue = 98 * 1024
+            await session.commit()
+
+        steps = (
+            ("добавление процесса и действия", add),
+            ("смена статуса процесса",
+             lambda session: QueueService(session).set_process_status(1, "pending")),
+            ("смена статуса действия",
+             lambda session: QueueService(session).set_action_status(1, "pending")),
+            ("удаление действия",
+             lambda session: QueueService(session).remove_action(2)),
+            ("удаление процесса с действиями",
+             lambda session: QueueService(session).remove_process(2)),
+            ("перенос процесса в другой заказ", move),
+        )
+        failures = 0
+        for label, step in steps:
+            async with session_maker(engine)() as session:
+                await step(session)
+            failures += not await compare(engine, label)
+        return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 100)))
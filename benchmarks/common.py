@@ -0,0 +1,61 @@
+"""Общие утилиты бенчмарков: временная БД и замер времени."""
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Iterator
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from loguru import logger  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.dao.database import Base, apply_sqlite_pragmas  # noqa: E402
+import app.models.models  # noqa: E402,F401
+
+# Логи DAO на каждую операцию исказили бы замеры
+logger.remove()
+
+
+@asynccontextmanager
+async def temp_database(
+    pragmas: dict | None = None,
+    **engine_kwargs,
+) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    Создаёт схему приложения во временном файле SQLite.
+    Без pragmas соединения работают с настройками SQLite по умолчанию.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp}/bench.sqlite3", **engine_kwargs)
+        if pragmas:
+            apply_sqlite_pragmas(engine, pragmas)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            yield engine
+        finally:
+            await engine.dispose()
+
+
+def session_maker(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@contextmanager
+def timer(
+    label: str,
+    rows: int | None = None,
+    unit: str = "строк",
+) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    rate = f", {rows / elapsed:,.1f} {unit}/с" if rows else ""
+    print(f"{label:<40} {elapsed:8.3f} с{rate}")